@@ -6,20 +6,39 @@ import concurrent.futures
 from urllib.parse import urlparse, urljoin
 import urllib.parse
 import xml.etree.ElementTree as ET
-from curl_cffi import requests
-from bs4 import BeautifulSoup
+from curl_cffi import requests, CurlOpt, CurlInfo, CurlHttpVersion
+from curl_cffi.curl import CURL_WRITEFUNC_ERROR
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
-import queue
+import collections
 import threading
 import os
 import datetime
 import time
 import subprocess
+import socket
+import ipaddress
 import hashlib
+import functools
+import random
+import shutil
+import gzip
 from tqdm import tqdm
 import csv
+import io
+import json
 import courlan
 
+try:
+    import lxml.html
+except ImportError:  # optional: link extraction falls back to BeautifulSoup
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: faster than lxml for link extraction when present
+    LexborHTMLParser = None
+
 
 class ObscuraResponse:
     """Response-like object wrapping obscura's stdout HTML output.
@@ -102,6 +121,153 @@ def obscura_fetch(url, wait=1, wait_until="networkidle2", timeout=30, nav_timeou
     return ObscuraResponse(result.stdout)
 
 
+def build_dns_pins(url):
+    """Resolve a URL's host once and return curl RESOLVE entries pinning it.
+
+    A single-domain crawl talks to one host for its whole run, so resolving
+    it up front lets every new connection skip the DNS lookup. Every IPv4
+    and IPv6 address the host resolves to is pinned, so curl can still fall
+    back between them. Returns an empty list when the host is already an IP
+    address or cannot be resolved, in which case curl falls back to its
+    normal resolver.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname
+    if not host:
+        return []
+    try:
+        ipaddress.ip_address(host)
+        return []
+    except ValueError:
+        pass
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except OSError:
+        return []
+    addresses = []
+    for family, _, _, _, sockaddr in infos:
+        address = f"[{sockaddr[0]}]" if family == socket.AF_INET6 else sockaddr[0]
+        if address not in addresses:
+            addresses.append(address)
+    if not addresses:
+        return []
+    ports = [parsed.port] if parsed.port else [80, 443]
+    return [f"{host}:{port}:{','.join(addresses)}" for port in ports]
+
+
+def open_session(start_url, verbose=False):
+    """Return a curl_cffi Session shared by every fetch of a run.
+
+    One session serves robots.txt and sitemap fetches and all spider and
+    cache workers (curl keeps a handle per thread), so connections to the
+    site are kept alive across requests. HTTPS connections offer HTTP/2
+    and fall back to HTTP/1.1 when the server doesn't take it. The start
+    host's address is pinned so it is resolved only once.
+    """
+    dns_pins = build_dns_pins(start_url)
+    if verbose and dns_pins:
+        logging.info(f"Pinned DNS for crawl: {', '.join(dns_pins)}")
+    return requests.Session(
+        curl_options={CurlOpt.RESOLVE: dns_pins} if dns_pins else None,
+        http_version=CurlHttpVersion.V2TLS,
+    )
+
+
+# How often (in pages) the crawl progress bar re-estimates its total
+PROGRESS_ESTIMATE_INTERVAL = 10
+
+# Largest page body kept from a response (bytes); the transfer is cut off
+# once this much has arrived
+MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+
+def is_html_type(content_type):
+    """Whether a Content-Type header value names an HTML page."""
+    content_type = content_type.lower()
+    return 'text/html' in content_type or 'application/xhtml+xml' in content_type
+
+
+def fetch_capped(session, url, limit=MAX_PAGE_BYTES, html_only=False, **kwargs):
+    """GET url on session, keeping at most limit bytes of its body.
+
+    Returns (response, body). The body is collected through content_callback
+    rather than stream=True: curl_cffi runs a streamed request on a copy of
+    the curl handle, so its connection is never reused. A body that passes
+    limit is cut off there and the truncated bytes are returned. With
+    html_only, a response whose Content-Type isn't HTML is cut off at its
+    first chunk and comes back with an empty body.
+    """
+    chunks = []
+    size = 0
+    aborted = False
+
+    def collect(chunk):
+        nonlocal size, aborted
+        if html_only and not chunks:
+            # Headers are complete by the first body chunk
+            content_type = session.curl.getinfo(CurlInfo.CONTENT_TYPE) or b''
+            if not is_html_type(content_type.decode('latin-1')):
+                aborted = True
+                return CURL_WRITEFUNC_ERROR
+        if size + len(chunk) >= limit:
+            chunks.append(chunk[:limit - size])
+            size = limit
+            aborted = True
+            return CURL_WRITEFUNC_ERROR  # abort the transfer
+        chunks.append(chunk)
+        size += len(chunk)
+        return len(chunk)
+
+    try:
+        response = session.get(url, content_callback=collect, **kwargs)
+    except requests.exceptions.RequestException as e:
+        # Our own abort still carries the response headers
+        if not aborted or getattr(e, 'response', None) is None:
+            raise
+        response = e.response
+    return response, b"".join(chunks)
+
+
+# Retry backoff schedules (seconds) for a single URL. Kept short so one bad
+# page doesn't pin a worker; jitter keeps retrying workers out of lockstep.
+CURL_RETRY_DELAYS = [0.5, 1, 2, 4, 8]
+OBSCURA_RETRY_DELAYS = [1, 2, 4]
+
+# Consecutive failed fetches after which the spider pauses a host, how long
+# each pause lasts (seconds), and how many pauses in a row with no success
+# before the host is given up on
+HOST_FAILURE_LIMIT = 10
+HOST_COOLDOWN = 30
+HOST_MAX_TRIPS = 5
+
+
+def jittered(delay):
+    """Return delay plus up to 50% random jitter."""
+    return delay + random.uniform(0, delay / 2)
+
+
+# curl errors worth retrying. Newer curl_cffi raises a typed Timeout;
+# older releases only say what went wrong in the message.
+_curl_exceptions = getattr(requests, 'exceptions', None)
+TRANSIENT_ERROR_TYPES = (_curl_exceptions.Timeout,) if _curl_exceptions else ()
+TRANSIENT_ERROR_MESSAGES = (
+    'connection reset', 'connection timed out', 'timeout',
+    'recv failure', 'operation timed out',
+)
+
+
+# Response codes that mean the server wants fewer requests
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def is_transient_error(error):
+    """Return True for a curl timeout or dropped connection that a retry may fix."""
+    if isinstance(error, TRANSIENT_ERROR_TYPES):
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in TRANSIENT_ERROR_MESSAGES)
+
+
 # Global constants for file extensions to skip
 SKIP_EXTENSIONS = [
     # Style and script files
@@ -128,9 +294,233 @@ SKIP_EXTENSIONS = [
     '.conf', '.cfg', '.env'
 ]
 
+# A path can only match on its last ".", so one set lookup replaces an
+# endswith() scan over every extension ('.min.js' and '.min.css' are
+# already covered by '.js' and '.css')
+_SKIP_EXTENSION_SET = frozenset(SKIP_EXTENSIONS)
+
+
+def has_skip_extension(path):
+    """Return True if path (or URL) ends with one of SKIP_EXTENSIONS, ignoring case."""
+    dot = path.rfind('.')
+    return dot != -1 and path[dot:].lower() in _SKIP_EXTENSION_SET
+
 # Additional constants for common non-content URLs
 SKIP_QUERY_PARAMS = ['?replytocom=', '?share=', '?like=', '?print=']
 
+# URL shapes treated as pagination by --ignore-pagination, compiled once
+PAGINATION_PATTERNS = [
+    re.compile(r'/page/\d+/?$'),                    # /page/2/
+    re.compile(r'/p/\d+/?$'),                       # /p/2/
+    re.compile(r'/page-\d+/?$'),                    # /page-2/
+    re.compile(r'\?page=\d+$'),                     # ?page=2
+    re.compile(r'\?p=\d+$'),                        # ?p=2
+    re.compile(r'\?pg=\d+$'),                       # ?pg=2
+    re.compile(r'\?paged=\d+$'),                    # ?paged=2
+    re.compile(r'\?offset=\d+$'),                   # ?offset=20
+    re.compile(r'\?start=\d+$'),                    # ?start=10
+    re.compile(r'\?from=\d+$'),                     # ?from=10
+    re.compile(r'\?[a-zA-Z0-9_-]+=\d+&page=\d+$'),  # ?category=news&page=2
+]
+
+# URL shapes treated as WordPress category/tag archives by --ignore-categories-tags
+CATEGORY_TAG_PATTERNS = [
+    # Category patterns
+    re.compile(r'/category/[^/]+/?$'),       # /category/garden/
+    re.compile(r'/categories/[^/]+/?$'),     # /categories/garden/
+    re.compile(r'/cat/[^/]+/?$'),            # /cat/garden/
+    re.compile(r'\?cat=\d+$'),               # ?cat=5
+    re.compile(r'\?category=[\w-]+$'),       # ?category=garden
+    re.compile(r'\?category_name=[\w-]+$'),  # ?category_name=garden
+    re.compile(r'/topics/[^/]+/?$'),         # /topics/garden/
+    re.compile(r'/subject/[^/]+/?$'),        # /subject/garden/
+
+    # Tag patterns
+    re.compile(r'/tag/[^/]+/?$'),            # /tag/thing/
+    re.compile(r'/tags/[^/]+/?$'),           # /tags/thing/
+    re.compile(r'\?tag=[\w-]+$'),            # ?tag=thing
+    re.compile(r'/label/[^/]+/?$'),          # /label/thing/
+    re.compile(r'/keyword/[^/]+/?$'),        # /keyword/thing/
+    re.compile(r'/topic/[^/]+/?$'),          # /topic/thing/
+]
+
+
+def combine_patterns(patterns):
+    """Join compiled patterns into one alternation, so a URL is scanned once."""
+    return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in patterns))
+
+
+PAGINATION_RE = combine_patterns(PAGINATION_PATTERNS)
+CATEGORY_TAG_RE = combine_patterns(CATEGORY_TAG_PATTERNS)
+
+# Discovered sitemap URLs are remembered per site for this long (seconds)
+DISCOVERY_CACHE_TTL = 24 * 60 * 60
+DISCOVERY_CACHE_NAME = "discovery.json"
+
+# Sub-sitemaps of one index, and discovery probes, are fetched this many at a time
+SITEMAP_FETCH_WORKERS = 8
+
+# detect_sitemap_format's default for "text_sitemap_urls not run yet"
+# (None is a real result: not a text sitemap)
+_NOT_CHECKED = object()
+
+# With --sitemap-cache, sitemap bodies are kept in this directory under
+# sites/<domain>/ with their ETag/Last-Modified, so later runs can revalidate
+# with a conditional GET instead of downloading them again
+SITEMAP_CACHE_NAME = "sitemap-cache"
+
+# Only <a href> tags are kept when parsing a page for links; the rest of the
+# document is tokenized but never built into a tree
+ANCHOR_STRAINER = SoupStrainer('a', href=True)
+
+
+def extract_hrefs(html):
+    """Return the distinct href values of a document's <a> tags, in document order.
+
+    The fastest installed C parser is used: selectolax's Lexbor engine, then
+    lxml. Otherwise, or for input they can't take as-is (bytes that aren't
+    UTF-8, which need charset sniffing; for lxml, an empty page or a str
+    with an XML encoding declaration), BeautifulSoup with html.parser is used.
+    """
+    if LexborHTMLParser is not None or lxml is not None:
+        try:
+            # Both C parsers mis-decode bytes without a <meta charset>
+            text = html.decode('utf-8') if isinstance(html, bytes) else html
+        except UnicodeDecodeError:
+            text = None
+        if text is not None and LexborHTMLParser is not None:
+            # A bare <a href> has no value in Lexbor; the other parsers report ''
+            return list(dict.fromkeys(node.attributes['href'] or ''
+                                      for node in LexborHTMLParser(text).css('a[href]')))
+        if text is not None:
+            try:
+                return list(dict.fromkeys(str(href) for href in lxml.html.fromstring(text).xpath('//a/@href')))
+            except (ValueError, lxml.etree.ParserError):
+                pass
+    soup = BeautifulSoup(html, 'html.parser', parse_only=ANCHOR_STRAINER)
+    return list(dict.fromkeys(link['href'] for link in soup.find_all('a', href=True)))
+
+
+# <loc> values in sitemap XML. [^<]* scans each value in one linear pass
+# (no lazy-quantifier backtracking); CDATA-wrapped values don't match and
+# are left to the ElementTree parser.
+LOC_RE = re.compile(r'<loc>([^<]*)</loc>')
+
+# href attribute values, for regex link extraction from non-XML sitemaps
+HREF_ATTR_RE = re.compile(r'href=[\'"]?([^\'" >]+)[\'"]?')
+
+# hrefs that can never lead to a crawlable page (in-page anchors, scripts, mail/phone links)
+SKIP_HREF_RE = re.compile(r'\s*(?:#|javascript:|mailto:|tel:|data:)', re.IGNORECASE)
+
+# Sitemap protocol elements, with and without the sitemaps.org namespace
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+SITEMAP_ENTRY_TAGS = {SITEMAP_NS + 'sitemap': 'sitemap', 'sitemap': 'sitemap',
+                      SITEMAP_NS + 'url': 'url', 'url': 'url'}
+
+
+def iterparse_sitemap_locs(content):
+    """Stream the <loc> values out of an XML sitemap.
+
+    Returns (sub_sitemap_locs, page_locs). Each <sitemap>/<url> entry is
+    cleared as soon as it closes, so the document tree never grows beyond
+    one entry at a time. Raises ET.ParseError on malformed XML.
+    """
+    source = io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content)
+    locs = {'sitemap': [], 'url': []}
+    for _, elem in ET.iterparse(source, events=('end',)):
+        kind = SITEMAP_ENTRY_TAGS.get(elem.tag)
+        if kind is None:
+            continue
+        loc = elem.find(SITEMAP_NS + 'loc')
+        if loc is None:
+            loc = elem.find('loc')
+        if loc is not None and loc.text and loc.text.strip():
+            locs[kind].append(loc.text.strip())
+        elem.clear()
+    return locs['sitemap'], locs['url']
+
+
+@functools.lru_cache(maxsize=65536)
+def _quote_filename(url):
+    """Percent-encode a URL into a file name, memoized across cache writes."""
+    # Cut the name if it's too long.
+    return urllib.parse.quote(url, safe='-_.')[:200]
+
+
+@functools.lru_cache(maxsize=200_000)
+def _parse_url(url):
+    """urlparse, memoized: the same links recur on every page of a site."""
+    return urlparse(url)
+
+
+def format_csv_lines(rows):
+    """Yield each row as a CSV line, exactly as csv.writer would write it.
+
+    Report rows are nearly always plain URLs that need no quoting, so those
+    are joined directly; only rows with commas, quotes, line breaks or
+    non-string fields go through csv.writer.
+    """
+    quoted = io.StringIO()
+    writer = csv.writer(quoted)
+    for row in rows:
+        try:
+            line = ','.join(row)
+        except TypeError:
+            line = None
+        if (line is None or not line or line.count(',') != len(row) - 1
+                or '"' in line or '\n' in line or '\r' in line):
+            writer.writerow(row)
+            yield quoted.getvalue()
+            quoted.seek(0)
+            quoted.truncate()
+        else:
+            yield line + '\r\n'
+
+
+@functools.lru_cache(maxsize=200_000)
+def crawl_link(full_url, base_domain):
+    """Return the cleaned form of an absolute link if the spider should follow it, else None.
+
+    Only http(s) links on base_domain without a skipped file extension are
+    followed; the fragment and tracking query parameters (utm_*, fbclid,
+    gclid, ...) are stripped so the same page isn't crawled more than once.
+    Memoized: navigation links resolve to the same URL on every page.
+    """
+    parsed_url = urlparse(full_url)
+    if parsed_url.scheme not in ('http', 'https') or parsed_url.netloc != base_domain:
+        return None
+    if has_skip_extension(parsed_url.path):
+        return None
+    if parsed_url.fragment:
+        full_url = full_url.split('#', 1)[0]
+    return courlan.clean_url(full_url) or None
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_url(url):
+    """Normalize a URL for UrlProcessor.normalize_url, memoized: most pages
+    appear in both the sitemap and the crawl results."""
+    parsed = urlparse(url)
+
+    # Remove trailing slash if present
+    path = parsed.path
+    if path.endswith('/') and path != '/':
+        path = path[:-1]
+    elif not path:
+        path = '/'
+
+    # Lowercase the domain and path (URL paths are case-insensitive
+    # on most servers, and sites commonly mix case)
+    netloc = parsed.netloc.lower()
+    path = path.lower()
+
+    # Force https — we always connect via HTTPS, and sites that
+    # have internal http:// links point to the same pages
+    scheme = 'https'
+
+    # Reconstruct URL without query parameters and fragments
+    return f"{scheme}://{netloc}{path}"
+
 
 class ThreadMonitor:
     def __init__(self, max_thread_time=60, on_timeout=None):
@@ -139,17 +529,20 @@ class ThreadMonitor:
         self.thread_lock = threading.Lock()
         self.monitor_running = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()  # wakes the monitor as soon as it's stopped
         self.on_timeout = on_timeout  # Called when a thread exceeds the time limit
 
     def start_monitoring(self):
         """Start the monitoring thread."""
         self.monitor_running = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_threads, daemon=True)
         self.monitor_thread.start()
 
     def stop_monitoring(self):
         """Stop the monitoring thread."""
         self.monitor_running = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
 
@@ -186,7 +579,182 @@ class ThreadMonitor:
                 if self.on_timeout:
                     self.on_timeout()
 
-            time.sleep(1.0)
+            # Check once a second, but return immediately when stopped
+            if self._stop_event.wait(1.0):
+                break
+
+
+class UrlFrontier:
+    """FIFO of (url, source_url) pairs shared by the spider's worker threads.
+
+    A plain deque guarded by a single Condition: each put/get takes one lock
+    instead of queue.Queue's separate mutex plus not_empty/not_full/
+    all_tasks_done conditions. Every item taken with get() must be marked
+    with task_done(); once nothing is queued or in progress the frontier is
+    finished() and all waiting workers are woken at once.
+    """
+    def __init__(self):
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self._pending = 0  # items put but not yet marked done
+
+    def put(self, item):
+        """Append an item and wake one waiting worker."""
+        with self._cond:
+            self._items.append(item)
+            self._pending += 1
+            self._cond.notify()
+
+    def put_many(self, items):
+        """Append several items under one lock acquisition and wake enough workers."""
+        items = list(items)
+        if not items:
+            return
+        with self._cond:
+            self._items.extend(items)
+            self._pending += len(items)
+            self._cond.notify(len(items))
+
+    def get(self, timeout=None):
+        """Pop the oldest item, waiting up to timeout seconds.
+
+        Returns None if nothing arrived in time, or straight away if the
+        frontier is finished.
+        """
+        with self._cond:
+            if not self._items and self._pending:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def task_done(self):
+        """Mark one item from get() as processed."""
+        with self._cond:
+            self._pending -= 1
+            if not self._pending:
+                self._cond.notify_all()
+
+    def wake_all(self):
+        """Wake every waiting worker, e.g. so it can notice an interrupt."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def finished(self):
+        """True once every item put has been marked done."""
+        return not self._pending
+
+    def qsize(self):
+        """Approximate number of queued items."""
+        return len(self._items)
+
+    def empty(self):
+        """True if no items are queued."""
+        return not self._items
+
+
+class AdaptiveLimiter:
+    """Concurrency cap that backs off while the server is struggling (AIMD).
+
+    Starts at limit, which is also the ceiling: the limiter only ever backs
+    off and recovers, it never runs more requests than the worker pool it
+    guards. Each throttled request (connection error, timeout, 429 or 503)
+    halves the cap, never below minimum; each success raises it by one,
+    back up to limit. Other failures leave it unchanged.
+    """
+    def __init__(self, limit, minimum=1):
+        self.max_limit = max(limit, minimum)
+        self.minimum = minimum
+        self.limit = self.max_limit
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait until fewer than limit requests are in flight, then take a slot."""
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, success):
+        """Give a slot back, growing the limit on success and halving it on failure.
+
+        success=None gives the slot back without adjusting the limit.
+        """
+        with self._cond:
+            self._active -= 1
+            if success:
+                self.limit = min(self.max_limit, self.limit + 1)
+            elif success is not None:
+                self.limit = max(self.minimum, self.limit // 2)
+            self._cond.notify_all()
+
+
+class HostCircuitBreaker:
+    """Per-host circuit breaker that pauses a failing host instead of dropping it.
+
+    After limit consecutive failures a host is paused for cooldown seconds.
+    Once the pause is over a single trial request is let through: success
+    closes the breaker, failure pauses the host again. After max_trips
+    pauses in a row without a success the host is given up on.
+    """
+    def __init__(self, limit, cooldown, max_trips):
+        self.limit = limit
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self._failures = collections.Counter()
+        self._trips = collections.Counter()
+        self._open_until = {}
+        self._trials = set()
+        self._lock = threading.Lock()
+
+    def wait_time(self, host):
+        """Return 0 if a request to host may go now, else seconds to hold off.
+
+        Returns None once the host has been given up on. The first caller
+        after a pause takes the trial request; later callers keep waiting
+        until its outcome is recorded.
+        """
+        with self._lock:
+            if self._trips[host] >= self.max_trips:
+                return None
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return 0
+            if host in self._trials:
+                return min(self.cooldown, 1.0)
+            remaining = open_until - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self._trials.add(host)
+            return 0
+
+    def given_up(self, host):
+        """Return True once host has been paused max_trips times in a row."""
+        with self._lock:
+            return self._trips[host] >= self.max_trips
+
+    def record_success(self, host):
+        """Close the breaker and reset the host's failure count."""
+        with self._lock:
+            self._failures[host] = 0
+            self._trips[host] = 0
+            self._open_until.pop(host, None)
+            self._trials.discard(host)
+
+    def record_failure(self, host):
+        """Count a failure; return True if it (re)opened the breaker."""
+        with self._lock:
+            if host in self._trials:
+                self._trials.discard(host)
+            else:
+                self._failures[host] += 1
+                if self._failures[host] < self.limit or host in self._open_until:
+                    return False
+            self._trips[host] += 1
+            self._open_until[host] = time.monotonic() + self.cooldown
+            return True
+
 
 class Config:
     def __init__(self, args):
@@ -214,6 +782,8 @@ class Config:
             self.obscura_timeout = max(self.obscura_nav_timeout * 1.5, self.obscura_nav_timeout + 1)
         self.obscura_stealth = not getattr(args, 'obscura_stealth_disable', False)
         self.curl_cffi = getattr(args, 'curl_cffi', False)
+        # Write cached pages and sitemaps gzip-compressed (.html.gz / .xml.gz)
+        self.gzip_cache = getattr(args, 'gzip_cache', False)
 
         # Parse domain from URL
         self.domain = urlparse(self.start_url).netloc
@@ -224,6 +794,19 @@ class Config:
         
         # Set up output directory
         self.output_dir = os.path.join("sites", self.domain, self.timestamp)
+        
+        # With --discovery-cache, a discovered sitemap URL is remembered next
+        # to this site's scan directories (None disables)
+        if getattr(args, 'discovery_cache', False):
+            self.discovery_cache = os.path.join("sites", self.domain, DISCOVERY_CACHE_NAME)
+        else:
+            self.discovery_cache = None
+        # With --sitemap-cache, fetched sitemaps are kept for conditional
+        # re-fetching by later runs (None disables)
+        if getattr(args, 'sitemap_cache', False):
+            self.sitemap_cache = os.path.join("sites", self.domain, SITEMAP_CACHE_NAME)
+        else:
+            self.sitemap_cache = None
 
 
 class UrlProcessor:
@@ -232,26 +815,7 @@ class UrlProcessor:
         
     def normalize_url(self, url):
         """Normalize URL to avoid duplicates due to trivial differences."""
-        parsed = urlparse(url)
-
-        # Remove trailing slash if present
-        path = parsed.path
-        if path.endswith('/') and path != '/':
-            path = path[:-1]
-        elif not path:
-            path = '/'
-
-        # Lowercase the domain and path (URL paths are case-insensitive
-        # on most servers, and sites commonly mix case)
-        netloc = parsed.netloc.lower()
-        path = path.lower()
-
-        # Force https — we always connect via HTTPS, and sites that
-        # have internal http:// links point to the same pages
-        scheme = 'https'
-
-        # Reconstruct URL without query parameters and fragments
-        return f"{scheme}://{netloc}{path}"
+        return _normalize_url(url)
     
     def is_valid_url(self, url):
         """Check if a URL is valid and should be included in results."""
@@ -259,9 +823,8 @@ class UrlProcessor:
             return False
             
         # Skip URLs with common non-content extensions
-        for ext in SKIP_EXTENSIONS:
-            if url.lower().endswith(ext):
-                return False
+        if has_skip_extension(url):
+            return False
                 
         # Skip URLs with common query parameters that indicate non-content
         for param in SKIP_QUERY_PARAMS:
@@ -272,55 +835,23 @@ class UrlProcessor:
     
     def is_pagination_url(self, url):
         """Check if a URL appears to be a pagination URL."""
-        # Common pagination patterns
-        pagination_patterns = [
-            r'/page/\d+/?$',           # /page/2/
-            r'/p/\d+/?$',              # /p/2/
-            r'/page-\d+/?$',           # /page-2/
-            r'\?page=\d+$',            # ?page=2
-            r'\?p=\d+$',               # ?p=2
-            r'\?pg=\d+$',              # ?pg=2
-            r'\?paged=\d+$',           # ?paged=2
-            r'\?offset=\d+$',          # ?offset=20
-            r'\?start=\d+$',           # ?start=10
-            r'\?from=\d+$',            # ?from=10
-            r'\?pg=\d+$',              # ?pg=2
-            r'\?[a-zA-Z0-9_-]+=\d+&page=\d+$',  # ?category=news&page=2
-        ]
-        
-        for pattern in pagination_patterns:
-            if re.search(pattern, url):
-                return True
-        return False
+        return PAGINATION_RE.search(url) is not None
     
     def is_category_or_tag_url(self, url):
         """Check if a URL appears to be a WordPress category or tag URL."""
-        # Common WordPress category and tag patterns
-        patterns = [
-            # Category patterns
-            r'/category/[^/]+/?$',          # /category/garden/
-            r'/categories/[^/]+/?$',        # /categories/garden/
-            r'/cat/[^/]+/?$',               # /cat/garden/
-            r'\?cat=\d+$',                  # ?cat=5
-            r'\?category=[\w-]+$',          # ?category=garden
-            r'\?category_name=[\w-]+$',     # ?category_name=garden
-            r'/topics/[^/]+/?$',            # /topics/garden/
-            r'/subject/[^/]+/?$',           # /subject/garden/
-            
-            # Tag patterns
-            r'/tag/[^/]+/?$',               # /tag/thing/
-            r'/tags/[^/]+/?$',              # /tags/thing/
-            r'\?tag=[\w-]+$',               # ?tag=thing
-            r'/label/[^/]+/?$',             # /label/thing/
-            r'/keyword/[^/]+/?$',           # /keyword/thing/
-            r'/topic/[^/]+/?$',             # /topic/thing/
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, url):
-                return True
-        return False
+        return CATEGORY_TAG_RE.search(url) is not None
     
+    def normalize_with_sources(self, urls, sources, default_source):
+        """Validate and normalize urls in a single pass.
+
+        Returns a dict mapping each normalized URL to where it was found
+        (default_source if unknown); its keys are the normalized URL set.
+        """
+        is_valid = self.is_valid_url
+        normalize = self.normalize_url
+        get_source = sources.get
+        return {normalize(url): get_source(url, default_source) for url in urls if is_valid(url)}
+
     def filter_urls(self, urls):
         """Filter URLs based on configuration settings."""
         filtered_urls = set()
@@ -345,12 +876,11 @@ class CacheManager:
         self.config = config
         self.output_dir = config.output_dir
         self.verbose = config.verbose
+        self._ready_dirs = set()  # cache directories already created
         
     def url_to_filename(self, url):
         """Turn a URL into a safe file name."""
-        filename = urllib.parse.quote(url, safe='-_.')
-        # Cut the name if it's too long.
-        return filename[:200]
+        return _quote_filename(url)
     
     def cache_content(self, url, content, is_sitemap=False):
         """Cache content to a file."""
@@ -366,16 +896,29 @@ class CacheManager:
                 cache_dir = os.path.join(self.output_dir, "cache")
                 file_ext = ".html"
                 
-            # Create directory if it doesn't exist
-            os.makedirs(cache_dir, exist_ok=True)
+            # Create the directory on first use only, not on every write
+            if cache_dir not in self._ready_dirs:
+                os.makedirs(cache_dir, exist_ok=True)
+                self._ready_dirs.add(cache_dir)
             
             # Create the file path
             filename = self.url_to_filename(url) + file_ext
             file_path = os.path.join(cache_dir, filename)
             
-            # Write content to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write content to file. Raw response bytes are written as-is,
+            # skipping a decode/re-encode round trip.
+            if self.config.gzip_cache:
+                # Level 1: markup still shrinks several-fold for little CPU
+                if not isinstance(content, bytes):
+                    content = content.encode('utf-8')
+                with gzip.open(file_path + '.gz', 'wb', compresslevel=1) as f:
+                    f.write(content)
+            elif isinstance(content, bytes):
+                with open(file_path, 'wb') as f:
+                    f.write(content)
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
                 
             if self.verbose:
                 logging.debug(f"Cached content for {url}")
@@ -391,6 +934,7 @@ class CacheManager:
             "missing_from_site.csv",
             "all_sitemap_urls.csv",
             "all_site_urls.csv",
+            "unfetched_urls.csv",
             "comparison_missing_from_site.csv",
             "comparison_missing_from_sitemap.csv"
         ]
@@ -405,9 +949,13 @@ class CacheManager:
         
         for filename in csv_files:
             file_path = os.path.join(self.output_dir, filename)
-            if os.path.exists(file_path):
-                files_to_copy.append((file_path, filename))
-                total_size += os.path.getsize(file_path)
+            # One stat per file answers both "does it exist" and "how big"
+            try:
+                size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                continue
+            files_to_copy.append((file_path, filename))
+            total_size += size
         
         if not files_to_copy:
             if self.verbose:
@@ -423,7 +971,6 @@ class CacheManager:
             # Copy each file to the results directory
             for file_path, filename in files_to_copy:
                 dest_path = os.path.join(results_dir, filename)
-                import shutil
                 shutil.copy2(file_path, dest_path)
             
             if self.verbose:
@@ -440,14 +987,18 @@ class CacheManager:
                 print(f"Error copying output files: {str(e)}")
             return False
 class SitemapFetcher:
-    def __init__(self, config, cache_manager, url_processor):
+    def __init__(self, config, cache_manager, url_processor, session=None):
         self.config = config
         self.cache_manager = cache_manager
         self.url_processor = url_processor
         self.verbose = config.verbose
+        # curl_cffi session for robots.txt, discovery and sitemap fetches
+        self.session = session if session is not None else requests.Session()
         # Track sitemap URLs already fetched to avoid infinite recursion on
         # self-referential or circular sitemaps (e.g. a sitemap that lists itself)
         self.visited_sitemaps = set()
+        # Sub-sitemaps are fetched from several threads at once
+        self.visited_sitemaps_lock = threading.Lock()
 
     def discover_sitemap_url(self):
         """Try to automatically discover the sitemap URL."""
@@ -464,6 +1015,15 @@ class SitemapFetcher:
         parsed_url = urlparse(base_url)
         base_domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
+        # A recent discovery for this site skips robots.txt and all the probes
+        cached_url = self.load_cached_sitemap_url(base_domain)
+        if cached_url:
+            if verbose:
+                logging.info(f"Using cached sitemap location: {cached_url}")
+            else:
+                print(f"Using cached sitemap location: {cached_url}")
+            return cached_url
+        
         # Common sitemap locations to check
         potential_locations = [
             f"{base_domain}/sitemap.xml",
@@ -510,7 +1070,7 @@ class SitemapFetcher:
             logging.info(f"Checking robots.txt at {robots_url}")
         
         try:
-            response = requests.get(robots_url, timeout=3)
+            response = self.session.get(robots_url, timeout=3)
             
             if response.status_code == 200:
                 # Look for Sitemap: directive in robots.txt
@@ -523,28 +1083,29 @@ class SitemapFetcher:
                             print(f"Found sitemap in robots.txt: {sitemap_url}")
                     
                         # Cache the robots.txt file
-                        self.cache_manager.cache_content(robots_url, response.text, is_sitemap=False)
+                        self.cache_manager.cache_content(robots_url, response.content, is_sitemap=False)
+                        self.save_cached_sitemap_url(base_domain, sitemap_url)
                         return sitemap_url
         except Exception as e:
             if verbose:
                 logging.warning(f"Error checking robots.txt: {e}")
         
-        # Try common locations
-        for url in potential_locations:
-            if verbose:
-                logging.info(f"Checking potential sitemap at {url}")
-            
-            try:
-                response = requests.get(url, timeout=3)
-                if response.status_code == 200 and ('<urlset' in response.text or '<sitemapindex' in response.text):
+        # Try common locations, several at a time. The earliest location in
+        # the list that holds a sitemap still wins, as in a one-by-one walk.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=SITEMAP_FETCH_WORKERS)
+        try:
+            futures = [executor.submit(self.probe_sitemap_location, url) for url in potential_locations]
+            for url, future in zip(potential_locations, futures):
+                if future.result():
                     if verbose:
                         logging.info(f"Found sitemap at {url}")
                     else:
                         print(f"Found sitemap at {url}")
+                    self.save_cached_sitemap_url(base_domain, url)
                     return url
-            except Exception as e:
-                if verbose:
-                    logging.warning(f"Error checking {url}: {e}")
+        finally:
+            # Drop probes that haven't started; don't wait on those in flight
+            executor.shutdown(wait=False, cancel_futures=True)
         
         if verbose:
             logging.error("Could not automatically discover sitemap")
@@ -552,23 +1113,31 @@ class SitemapFetcher:
             print("Could not automatically discover sitemap")
         return None
 
+    def probe_sitemap_location(self, url):
+        """Return True if url serves an XML sitemap or sitemap index."""
+        if self.verbose:
+            logging.info(f"Checking potential sitemap at {url}")
+        try:
+            response = self.session.get(url, timeout=3)
+            return response.status_code == 200 and ('<urlset' in response.text or '<sitemapindex' in response.text)
+        except Exception as e:
+            if self.verbose:
+                logging.warning(f"Error checking {url}: {e}")
+            return False
+
     def extract_urls_with_regex(self, content, base_url):
         """Extract URLs using regex as a fallback method."""
         urls = set()
         
         # First try to extract URLs from <loc> tags (sitemap format)
-        loc_pattern = re.compile(r'<loc>(.*?)</loc>', re.DOTALL)
-        loc_matches = loc_pattern.findall(content)
+        loc_matches = LOC_RE.findall(content)
         
         if loc_matches:
             logging.info(f"Found {len(loc_matches)} URLs in <loc> tags")
-            for url in loc_matches:
-                urls.add(url.strip())
-            return urls
+            return {url.strip() for url in loc_matches}
         
         # If no <loc> tags found, try extracting from href attributes
-        url_pattern = re.compile(r'href=[\'"]?([^\'" >]+)[\'"]?')
-        matches = url_pattern.findall(content)
+        matches = HREF_ATTR_RE.findall(content)
         
         parsed_base = urlparse(base_url)
         base_domain = f"{parsed_base.scheme}://{parsed_base.netloc}"
@@ -603,14 +1172,224 @@ class SitemapFetcher:
         logging.info(f"Regex extraction found {len(urls)} URLs")
         return urls
 
+    def _read_discovery_cache(self):
+        """Load the on-disk discovery cache, treating a missing or corrupt file as empty."""
+        try:
+            with open(self.config.discovery_cache, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load_cached_sitemap_url(self, base_domain):
+        """Return the remembered sitemap URL for a site if it is fresh and still reachable."""
+        if not self.config.discovery_cache:
+            return None
+        entry = self._read_discovery_cache().get(base_domain)
+        if not isinstance(entry, dict):
+            return None
+        sitemap_url = entry.get('sitemap_url')
+        if not sitemap_url or time.time() - entry.get('discovered_at', 0) > DISCOVERY_CACHE_TTL:
+            return None
+        
+        # A HEAD request is enough to check the sitemap is still served;
+        # anything but a 2xx falls through to normal discovery
+        try:
+            response = self.session.head(sitemap_url, timeout=3, allow_redirects=True)
+            if not 200 <= response.status_code < 300:
+                return None
+        except Exception as e:
+            if self.verbose:
+                logging.warning(f"Cached sitemap {sitemap_url} is unreachable: {e}")
+            return None
+        return sitemap_url
+
+    def save_cached_sitemap_url(self, base_domain, sitemap_url):
+        """Remember a discovered sitemap URL for later runs against the same site."""
+        path = self.config.discovery_cache
+        if not path:
+            return
+        cache = self._read_discovery_cache()
+        cache[base_domain] = {'sitemap_url': sitemap_url, 'discovered_at': time.time()}
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # Write then rename so concurrent runs never see a half-written file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if self.verbose:
+                logging.warning(f"Could not save discovery cache {path}: {e}")
+
+    def _sitemap_cache_path(self, sitemap_url):
+        """Path (without extension) of the saved copy of a sitemap."""
+        digest = hashlib.sha256(sitemap_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.config.sitemap_cache, digest)
+
+    def load_saved_sitemap(self, sitemap_url):
+        """Return (validators, body) saved by an earlier run, or None."""
+        if not self.config.sitemap_cache:
+            return None
+        path = self._sitemap_cache_path(sitemap_url)
+        try:
+            with open(f"{path}.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(f"{path}.body", 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get('url') != sitemap_url:
+            return None
+        return meta, body
+
+    def save_sitemap(self, sitemap_url, response):
+        """Keep a sitemap body for revalidation if the server sent a validator."""
+        if not self.config.sitemap_cache:
+            return
+        headers = response.headers
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        body = response.content
+        if not isinstance(body, bytes) or not (isinstance(etag, str) or isinstance(last_modified, str)):
+            return
+        meta = {
+            'url': sitemap_url,
+            'etag': etag if isinstance(etag, str) else None,
+            'last_modified': last_modified if isinstance(last_modified, str) else None,
+            'encoding': response.encoding if isinstance(response.encoding, str) else None,
+        }
+        path = self._sitemap_cache_path(sitemap_url)
+        try:
+            os.makedirs(self.config.sitemap_cache, exist_ok=True)
+            # Body first, then metadata, each written then renamed, so a
+            # reader never pairs new validators with a half-written body
+            tmp_suffix = f".{os.getpid()}.tmp"
+            with open(f"{path}.body{tmp_suffix}", 'wb') as f:
+                f.write(body)
+            os.replace(f"{path}.body{tmp_suffix}", f"{path}.body")
+            with open(f"{path}.json{tmp_suffix}", 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(f"{path}.json{tmp_suffix}", f"{path}.json")
+        except OSError as e:
+            if self.verbose:
+                logging.warning(f"Could not save sitemap cache for {sitemap_url}: {e}")
+
+    def fetch_sitemap(self, sitemap_url):
+        """GET a sitemap and return (text, raw bytes).
+
+        A copy saved by an earlier run is revalidated with If-None-Match /
+        If-Modified-Since; on 304 Not Modified the saved body is reused.
+        """
+        saved = self.load_saved_sitemap(sitemap_url)
+        headers = {}
+        if saved:
+            meta, body = saved
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        response = self.session.get(sitemap_url, timeout=3, headers=headers or None)
+        if saved and response.status_code == 304:
+            if self.verbose:
+                logging.info(f"Sitemap {sitemap_url} not modified, using saved copy")
+            return body.decode(meta.get('encoding') or 'utf-8', errors='replace'), body
+        response.raise_for_status()
+        self.save_sitemap(sitemap_url, response)
+        return response.text, response.content
+
+    def detect_sitemap_format(self, content, text_urls=_NOT_CHECKED):
+        """Classify sitemap content as 'xml', 'text' or 'html' from its first bytes.
+
+        A caller that already ran text_sitemap_urls(content) passes its
+        result as text_urls, so a text-like document isn't split twice.
+        """
+        head = content[:256].lstrip()
+        if head.startswith('<?xml') or '<urlset' in head or '<sitemapindex' in head:
+            return 'xml'
+        if text_urls is _NOT_CHECKED:
+            text_urls = self.text_sitemap_urls(content)
+        if text_urls is not None:
+            return 'text'
+        return 'html'
+
+    def text_sitemap_urls(self, content):
+        """Return the URLs of a text sitemap, or None if content isn't one.
+
+        Text sitemaps are nothing but absolute URLs, one per line; the lines
+        are split and stripped once, both to recognize and to collect them.
+        """
+        if not content[:256].lstrip().startswith(('http://', 'https://')):
+            return None
+        urls = set(filter(None, map(str.strip, content.splitlines())))
+        if not all(url.startswith(('http://', 'https://')) for url in urls):
+            return None
+        return urls
+
+    def parse_html_sitemap(self, content, sitemap_url):
+        """Extract same-domain links (and linked XML sitemaps) from an HTML sitemap."""
+        urls = set()
+        url_sources = {}
+        sub_sitemap_urls = []
+        try:
+            sitemap_netloc = urlparse(sitemap_url).netloc
+            
+            # Look for links in the page
+            for href in extract_hrefs(content):
+                # Handle relative URLs
+                if not href.startswith(('http://', 'https://')):
+                    href = urljoin(sitemap_url, href)
+                
+                # Check if it's a sitemap link
+                if 'sitemap' in href.lower() and href.endswith(('.xml', '.xml.gz')):
+                    if self.verbose:
+                        logging.info(f"Found sitemap link in HTML: {href}")
+                    sub_sitemap_urls.append(href)
+                elif _parse_url(href).netloc == sitemap_netloc:
+                    # Only keep URLs from the same domain
+                    urls.add(href)
+                    url_sources[href] = sitemap_url
+        except Exception as e:
+            if self.verbose:
+                logging.error(f"HTML sitemap parsing error: {e}")
+        
+        # If the parser failed or found nothing, use regex as a last resort
+        if not urls:
+            if self.verbose:
+                logging.info("No URLs found in HTML sitemap, trying regex extraction")
+            regex_urls = self.extract_urls_with_regex(content, sitemap_url)
+            urls.update(regex_urls)
+            url_sources.update(dict.fromkeys(regex_urls, sitemap_url))
+        sub_urls, sub_sources = self.get_sub_sitemap_urls(sub_sitemap_urls)
+        urls.update(sub_urls)
+        url_sources.update(sub_sources)
+        return urls, url_sources
+
+    def get_sub_sitemap_urls(self, sub_sitemap_urls):
+        """Fetch several sub-sitemaps concurrently and merge their URLs and sources."""
+        urls = set()
+        url_sources = {}
+        sub_sitemap_urls = list(sub_sitemap_urls)
+        if not sub_sitemap_urls:
+            return urls, url_sources
+        workers = min(SITEMAP_FETCH_WORKERS, len(sub_sitemap_urls))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields in input order, so sources are merged as a serial walk would
+            for sub_urls, sub_sources in executor.map(self.get_sitemap_urls, sub_sitemap_urls):
+                urls.update(sub_urls)
+                url_sources.update(sub_sources)
+        return urls, url_sources
+
     def get_sitemap_urls(self, sitemap_url):
         """Extract all URLs from a sitemap, handling different formats and recursion."""
         # Guard against infinite recursion on self-referential or circular sitemaps
-        if sitemap_url in self.visited_sitemaps:
+        with self.visited_sitemaps_lock:
+            already_visited = sitemap_url in self.visited_sitemaps
+            self.visited_sitemaps.add(sitemap_url)
+        if already_visited:
             if self.verbose:
                 logging.info(f"Skipping already-visited sitemap: {sitemap_url}")
             return set(), {}
-        self.visited_sitemaps.add(sitemap_url)
 
         if self.verbose:
             logging.info(f"Fetching sitemap from {sitemap_url}")
@@ -619,21 +1398,36 @@ class SitemapFetcher:
         content = ""
         
         try:
-            response = requests.get(sitemap_url, timeout=3)
-            response.raise_for_status()
-            content = response.text
+            content, raw = self.fetch_sitemap(sitemap_url)
+            
+            # Cache the raw XML bytes as received, not the decoded text
+            self.cache_manager.cache_content(sitemap_url, raw, is_sitemap=True)
+            
+            # Text sitemaps (one URL per line) have no markup to parse, and
+            # are recognized and collected in the same pass
+            text_urls = self.text_sitemap_urls(content)
+            if text_urls is not None:
+                urls.update(text_urls)
+                url_sources.update(dict.fromkeys(text_urls, sitemap_url))
+                if self.verbose:
+                    logging.info(f"Found {len(urls)} URLs in text sitemap {sitemap_url}")
+                return urls, url_sources
             
-            # Cache the XML content
-            self.cache_manager.cache_content(sitemap_url, content, is_sitemap=True)
+            # Otherwise pick a single parsing path up front so the content
+            # is not re-scanned by every parser in turn
+            sitemap_format = self.detect_sitemap_format(content, text_urls)
             
-            # Try direct regex extraction of <loc> tags first (most reliable for malformed XML)
-            loc_urls = self.extract_urls_with_regex(content, sitemap_url)
+            # Try direct regex extraction of <loc> tags first (most reliable for malformed XML).
+            # HTML sitemaps skip straight to the HTML parser below.
+            loc_urls = set()
+            if sitemap_format == 'xml' or '<loc>' in content:
+                loc_urls = self.extract_urls_with_regex(content, sitemap_url)
             if loc_urls:
                 if self.verbose:
                     logging.info(f"Found {len(loc_urls)} URLs using direct <loc> tag extraction")
                 
                 # Check if any of these are sub-sitemaps
-                sitemap_urls = [url for url in loc_urls if (
+                sitemap_urls = {url for url in loc_urls if (
                     # Must end in a sitemap file extension (most reliable signal)
                     url.lower().endswith(('.xml', '.xml.gz'))
                     # Or be a known sitemap directory/index path
@@ -641,27 +1435,24 @@ class SitemapFetcher:
                         '/sitemap.xml', '/sitemap_index.xml', '/sitemap-index.xml',
                         '/sitemap/', '/sitemaps/',
                     ))
-                ) and not url.lower().endswith(('.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico'))]
+                ) and not url.lower().endswith(('.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico'))}
                 
                 if sitemap_urls:
                     if self.verbose:
                         logging.info(f"Found {len(sitemap_urls)} sub-sitemaps to process")
-                    for sub_sitemap_url in sitemap_urls:
-                        sub_urls, sub_sources = self.get_sitemap_urls(sub_sitemap_url)
-                        urls.update(sub_urls)
-                        url_sources.update(sub_sources)
+                    sub_urls, sub_sources = self.get_sub_sitemap_urls(sitemap_urls)
+                    urls.update(sub_urls)
+                    url_sources.update(sub_sources)
                         
                     # Remove the sitemap URLs from the regular URLs
-                    regular_urls = loc_urls - set(sitemap_urls)
+                    regular_urls = loc_urls - sitemap_urls
                     urls.update(regular_urls)
                     # Track sources for regular URLs
-                    for url in regular_urls:
-                        url_sources[url] = sitemap_url
+                    url_sources.update(dict.fromkeys(regular_urls, sitemap_url))
                 else:
                     urls.update(loc_urls)
                     # Track sources for all URLs
-                    for url in loc_urls:
-                        url_sources[url] = sitemap_url
+                    url_sources.update(dict.fromkeys(loc_urls, sitemap_url))
                     
                 if urls:
                     if self.verbose:
@@ -669,98 +1460,41 @@ class SitemapFetcher:
                     return urls, url_sources
             
             # If regex extraction didn't work, try standard XML parsing
-            if content.strip().startswith('<?xml') or '<urlset' in content or '<sitemapindex' in content:
+            # (catches namespace-prefixed <loc> tags the regex misses)
+            xml_parse_failed = False
+            if sitemap_format == 'xml':
                 try:
-                    # Handle XML sitemaps
-                    root = ET.fromstring(content)
-                    
-                    # Namespace handling
-                    namespaces = {
-                        'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-                        'xhtml': 'http://www.w3.org/1999/xhtml'
-                    }
-                    
+                    # Handle XML sitemaps, streaming entries instead of building the whole tree
+                    sitemaps, page_locs = iterparse_sitemap_locs(content)
+
                     # Check if this is a sitemap index
-                    sitemaps = root.findall('.//sm:sitemap/sm:loc', namespaces) or root.findall('.//sitemap/loc', {})
-                    
                     if sitemaps:
                         if self.verbose:
                             logging.info(f"Found sitemap index with {len(sitemaps)} sitemaps")
-                        for sitemap in sitemaps:
-                            sub_sitemap_url = sitemap.text.strip()
-                            sub_urls, sub_sources = self.get_sitemap_urls(sub_sitemap_url)
-                            urls.update(sub_urls)
-                            url_sources.update(sub_sources)
+                        sub_urls, sub_sources = self.get_sub_sitemap_urls(sitemaps)
+                        urls.update(sub_urls)
+                        url_sources.update(sub_sources)
                     else:
                         # Regular sitemap
-                        url_elements = (root.findall('.//sm:url/sm:loc', namespaces) or 
-                                       root.findall('.//url/loc', {}))
-                        
-                        for url_element in url_elements:
-                            url = url_element.text.strip()
-                            urls.add(url)
-                            url_sources[url] = sitemap_url
+                        urls.update(page_locs)
+                        url_sources.update(dict.fromkeys(page_locs, sitemap_url))
                             
                     if urls:
                         if self.verbose:
                             logging.info(f"Successfully parsed XML sitemap, found {len(urls)} URLs")
                         return urls, url_sources
                 except ET.ParseError as e:
+                    xml_parse_failed = True
                     if self.verbose:
                         logging.error(f"XML parsing error in sitemap {sitemap_url}: {e}")
             
             # If XML parsing failed or it's not an XML sitemap, try HTML parsing
-            if self.verbose:
-                logging.info(f"Attempting to parse {sitemap_url} as HTML sitemap")
-            
-            # Try BeautifulSoup parsing
-            try:
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Look for links in the page
-                for a_tag in soup.find_all('a', href=True):
-                    href = a_tag['href']
-                    
-                    # Handle relative URLs
-                    if not href.startswith(('http://', 'https://')):
-                        href = urljoin(sitemap_url, href)
-                    
-                    # Check if it's a sitemap link
-                    if 'sitemap' in href.lower() and href.endswith(('.xml', '.xml.gz')):
-                        if self.verbose:
-                            logging.info(f"Found sitemap link in HTML: {href}")
-                        sub_urls, sub_sources = self.get_sitemap_urls(href)
-                        urls.update(sub_urls)
-                        url_sources.update(sub_sources)
-                    else:
-                        # Parse the URL to check if it's from the same domain
-                        parsed_href = urlparse(href)
-                        parsed_sitemap = urlparse(sitemap_url)
-                        
-                        if parsed_href.netloc == parsed_sitemap.netloc:
-                            urls.add(href)
-                            url_sources[href] = sitemap_url
-            except Exception as e:
-                if self.verbose:
-                    logging.error(f"BeautifulSoup parsing error: {e}")
-            
-            # Check if it's a text sitemap (one URL per line)
-            if not urls and all(line.startswith(('http://', 'https://')) for line in content.splitlines() if line.strip()):
-                for line in content.splitlines():
-                    line = line.strip()
-                    if line and line.startswith(('http://', 'https://')):
-                        urls.add(line)
-                        url_sources[line] = sitemap_url
-            
-            # If still no URLs found, use regex as a last resort
-            if not urls:
+            if sitemap_format == 'html' or xml_parse_failed:
                 if self.verbose:
-                    logging.info("No URLs found with standard methods, trying regex extraction")
-                regex_urls = self.extract_urls_with_regex(content, sitemap_url)
-                urls.update(regex_urls)
-                # Add sources for regex-extracted URLs
-                for url in regex_urls:
-                    url_sources[url] = sitemap_url
+                    logging.info(f"Attempting to parse {sitemap_url} as HTML sitemap")
+                html_urls, html_sources = self.parse_html_sitemap(content, sitemap_url)
+                urls.update(html_urls)
+                url_sources.update(html_sources)
             
             if self.verbose:
                 logging.info(f"Found {len(urls)} URLs in sitemap {sitemap_url}")
@@ -777,28 +1511,55 @@ class SitemapFetcher:
                 if self.verbose:
                     logging.info(f"Regex extraction found {len(urls)} URLs after exception")
                 # Add sources for regex-extracted URLs
-                for url in regex_urls:
-                    url_sources[url] = sitemap_url
+                url_sources.update(dict.fromkeys(regex_urls, sitemap_url))
             except Exception as regex_error:
                 if self.verbose:
                     logging.error(f"Regex extraction also failed: {regex_error}")
             return urls, url_sources
 
 class WebsiteSpider:
-    def __init__(self, config, cache_manager, url_processor):
+    def __init__(self, config, cache_manager, url_processor, session=None):
         self.config = config
         self.cache_manager = cache_manager
         self.url_processor = url_processor
         self.verbose = config.verbose
+        # curl_cffi session for --curl-cffi fetches, shared with the sitemap fetcher
+        self.session = session if session is not None else requests.Session()
         self.interrupted = False
+        # Set together with interrupted; retry backoffs wait on it so they end early
+        self.stop_event = threading.Event()
+        self._frontier = None  # the running crawl's frontier, woken on interrupt
+        # URLs never fetched because their host was given up on -> where they were found
+        self.unfetched_urls = {}
         # Thread monitor signals interrupt when a worker exceeds the time limit
         self.thread_monitor = ThreadMonitor(
             max_thread_time=config.thread_timeout,
         )
         
     def set_interrupted(self):
-        """Set the interrupted flag."""
+        """Set the interrupted flag and wake any worker waiting for work or a retry."""
         self.interrupted = True
+        self.stop_event.set()
+        if self._frontier is not None:
+            self._frontier.wake_all()
+
+    def extract_links(self, html, page_url, base_domain):
+        """Return the unique, cleaned same-domain page links found in an HTML document.
+
+        hrefs are deduplicated before any URL work is done (menus and footers
+        repeat the same links), obvious non-page hrefs are dropped with one
+        regex match, and each survivor is joined and then checked and cleaned
+        by the memoized crawl_link, so links repeated across pages of the
+        site are only cleaned once per run.
+        """
+        links = {}  # dict keeps first-seen order while deduplicating
+        for href in extract_hrefs(html):
+            if SKIP_HREF_RE.match(href):
+                continue
+            clean_url = crawl_link(urljoin(page_url, href), base_domain)
+            if clean_url:
+                links[clean_url] = None
+        return list(links)
 
     def spider_website(self):
         """Spider a website and return all discovered URLs using parallel workers."""
@@ -814,8 +1575,11 @@ class WebsiteSpider:
         visited_urls = set()
         found_urls = set()
         url_sources = {}  # Dictionary to track where each URL was found
-        url_queue = queue.Queue()
+        unfetched_urls = self.unfetched_urls = {}
+        parsed_pages = {}  # (body digest, URL without query) -> first URL parsed with it
+        url_queue = UrlFrontier()
         url_queue.put((start_url, None))  # (url, source_url) tuple
+        self._frontier = url_queue
         
         # Locks for thread safety
         visited_lock = threading.Lock()
@@ -826,6 +1590,9 @@ class WebsiteSpider:
         url_attempts = {}
         max_retries = self.config.retries
 
+        # Hosts failing over and over are paused rather than dropped
+        breaker = HostCircuitBreaker(HOST_FAILURE_LIMIT, HOST_COOLDOWN, HOST_MAX_TRIPS)
+
         # Counter for progress reporting
         visited_count = 0
         
@@ -837,210 +1604,222 @@ class WebsiteSpider:
             logging.info(f"Starting to spider {start_url} with {num_workers} parallel workers")
         else:
             print(f"Spidering website: {start_url}")
-            progress_bar = tqdm(total=initial_estimate, desc="Pages crawled", unit="pages", dynamic_ncols=True)
-        
-        # Variables for progress tracking
-        estimated_total = initial_estimate
-        last_update_time = time.time()
+            progress_bar = tqdm(total=initial_estimate, desc="Pages crawled", unit="pages",
+                                dynamic_ncols=True, mininterval=0.25)
+        # Rendering the bar has its own lock so it never holds up visited checks
+        progress_lock = threading.Lock()
         
         # Start the thread monitor
         self.thread_monitor.start_monitoring()
         
         def process_url():
-            nonlocal visited_count, last_update_time, estimated_total
-            idle_since = None  # track persistent empty-queue for clean shutdown
+            nonlocal visited_count
             while not self.interrupted and visited_count < max_pages:
                 try:
                     # Get URL with timeout to allow for interruption
-                    try:
-                        current_url, source_url = url_queue.get(timeout=1)
-                        idle_since = None  # got work, reset idle timer
-                    except queue.Empty:
-                        if url_queue.empty():
-                            now = time.time()
-                            if idle_since is None:
-                                idle_since = now
-                            elif now - idle_since > 3:
-                                # Queue empty >3s -- crawl is done
-                                break
+                    item = url_queue.get(timeout=1)
+                    if item is None:
+                        if url_queue.finished():
+                            # Every queued URL has been processed -- crawl is done
+                            break
                         continue
+                    current_url, source_url = item
+                    try:
+                        host = _parse_url(current_url).netloc
+                    
+                        # Skip if already visited
+                        with visited_lock:
+                            if current_url in visited_urls:
+                                continue
+                            visited_urls.add(current_url)
+                            visited_count += 1
+                            visit_number = visited_count
                     
-                    # Skip if already visited
-                    with visited_lock:
-                        if current_url in visited_urls:
-                            url_queue.task_done()
-                            continue
-                        visited_urls.add(current_url)
-                        visited_count += 1
-                        
                         # Update progress bar
-                        if not verbose and progress_bar:
-                            # Update the progress bar
-                            progress_bar.update(1)
+                        if progress_bar:
+                            with progress_lock:
+                                progress_bar.update(1)
                             
-                            # Periodically adjust the total based on queue size and visited count
-                            current_time = time.time()
-                            if current_time - last_update_time > 0.5:
-                                new_estimate = max(len(visited_urls) + url_queue.qsize(), len(visited_urls) + 5)
-                                if new_estimate > estimated_total:
-                                    estimated_total = new_estimate
-                                    progress_bar.total = estimated_total
-                                    progress_bar.refresh()
-                                last_update_time = current_time
+                                # Every few pages (or once the bar is full), grow the
+                                # total to cover what is still queued
+                                if (visit_number % PROGRESS_ESTIMATE_INTERVAL == 0
+                                        or visit_number >= progress_bar.total):
+                                    new_estimate = visit_number + max(url_queue.qsize(), 5)
+                                    if new_estimate > progress_bar.total:
+                                        progress_bar.total = new_estimate
+                                        progress_bar.refresh()
                     
-                    if verbose:
-                        logging.info(
-                            f"[tid={threading.get_ident()}] "
-                            f"Visiting {current_url} "
-                            f"({visited_count}/{max_pages}, queue={url_queue.qsize()})"
-                        )
+                        if verbose:
+                            logging.info(
+                                f"[tid={threading.get_ident()}] "
+                                f"Visiting {current_url} "
+                                f"({visited_count}/{max_pages}, queue={url_queue.qsize()})"
+                            )
                     
-                    # Generate a unique ID for this thread operation
-                    thread_op_id = f"spider-{threading.get_ident()}-{hash(current_url) % 10000}"
-                    self.thread_monitor.register_thread_start(thread_op_id)
+                        # Hold off while the host's circuit breaker is open
+                        hold_off = breaker.wait_time(host)
+                        while hold_off and not self.interrupted:
+                            self.stop_event.wait(hold_off)
+                            hold_off = breaker.wait_time(host)
+                        if hold_off is None:
+                            # Never fetched, so report it apart from the pages
+                            # the crawl really couldn't reach
+                            with found_lock:
+                                unfetched_urls[current_url] = source_url or current_url
+                            continue
+                        if self.interrupted:
+                            continue
                     
-                    try:
-                        if self.config.curl_cffi:
-                            # Fallback: use curl_cffi with exponential backoff
-                            retry_delays = [2, 4, 8, 16, 32]
-                            response = None
-                            last_error = None
-                            for retry, delay in enumerate(retry_delays):
-                                try:
-                                    response = requests.get(current_url, timeout=3)
-                                    break
-                                except Exception as e:
-                                    last_error = e
-                                    error_message = str(e).lower()
-                                    if any(err in error_message for err in [
-                                        'connection reset', 'connection timed out', 'timeout',
-                                        'recv failure', 'operation timed out'
-                                    ]):
-                                        if retry < len(retry_delays) - 1:
+                        # Generate a unique ID for this thread operation
+                        thread_op_id = f"spider-{threading.get_ident()}-{hash(current_url) % 10000}"
+                        self.thread_monitor.register_thread_start(thread_op_id)
+                    
+                        try:
+                            if self.config.curl_cffi:
+                                # Fallback: use curl_cffi with exponential backoff
+                                retry_delays = CURL_RETRY_DELAYS
+                                response = None
+                                last_error = None
+                                for retry, delay in enumerate(retry_delays):
+                                    try:
+                                        response, body = fetch_capped(self.session, current_url, html_only=True, timeout=3)
+                                        break
+                                    except Exception as e:
+                                        last_error = e
+                                        if is_transient_error(e):
+                                            if retry < len(retry_delays) - 1:
+                                                wait = jittered(delay)
+                                                if verbose:
+                                                    logging.warning(f"Connection error on {current_url}, retrying in {wait:.1f}s (attempt {retry+1}/{len(retry_delays)}): {e}")
+                                                self.stop_event.wait(wait)
+                                                continue
+                                        raise
+                                if response is None:
+                                    raise last_error
+                            else:
+                                # Default: use obscura for JavaScript rendering
+                                # Retry subprocess failures (crash, timeout) with short backoff.
+                                # obscura handles HTTP-level retry internally.
+                                obscura_retries = OBSCURA_RETRY_DELAYS
+                                response = None
+                                last_error = None
+                                for retry, delay in enumerate(obscura_retries):
+                                    try:
+                                        response = obscura_fetch(
+                                            url=current_url,
+                                            wait=self.config.obscura_wait,
+                                            wait_until=self.config.obscura_wait_until,
+                                            timeout=self.config.obscura_timeout,
+                                            nav_timeout=self.config.obscura_nav_timeout,
+                                            stealth=self.config.obscura_stealth,
+                                            obscura_path=self.config.obscura_path
+                                        )
+                                        break
+                                    except Exception as e:
+                                        last_error = e
+                                        if retry < len(obscura_retries) - 1:
+                                            wait = jittered(delay)
                                             if verbose:
-                                                logging.warning(f"Connection error on {current_url}, retrying in {delay}s (attempt {retry+1}/{len(retry_delays)}): {e}")
-                                            time.sleep(delay)
-                                            continue
-                                    raise
-                            if response is None:
-                                raise last_error
-                        else:
-                            # Default: use obscura for JavaScript rendering
-                            # Retry subprocess failures (crash, timeout) with short backoff.
-                            # obscura handles HTTP-level retry internally.
-                            obscura_retries = [1, 2, 4]
-                            response = None
-                            last_error = None
-                            for retry, delay in enumerate(obscura_retries):
-                                try:
-                                    response = obscura_fetch(
-                                        url=current_url,
-                                        wait=self.config.obscura_wait,
-                                        wait_until=self.config.obscura_wait_until,
-                                        timeout=self.config.obscura_timeout,
-                                        nav_timeout=self.config.obscura_nav_timeout,
-                                        stealth=self.config.obscura_stealth,
-                                        obscura_path=self.config.obscura_path
-                                    )
-                                    break
-                                except Exception as e:
-                                    last_error = e
-                                    if retry < len(obscura_retries) - 1:
-                                        if verbose:
-                                            logging.warning(
-                                                f"obscura error on {current_url}, "
-                                                f"retrying in {delay}s "
-                                                f"(attempt {retry+1}/{len(obscura_retries)}): {e}"
-                                            )
-                                        time.sleep(delay)
-                            if response is None:
-                                raise last_error
+                                                logging.warning(
+                                                    f"obscura error on {current_url}, "
+                                                    f"retrying in {wait:.1f}s "
+                                                    f"(attempt {retry+1}/{len(obscura_retries)}): {e}"
+                                                )
+                                            self.stop_event.wait(wait)
+                                if response is None:
+                                    raise last_error
                         
-                        with found_lock:
-                            found_urls.add(current_url)
-                            # Set the source - if it's the start URL, it's its own source
-                            if source_url is None:
-                                url_sources[current_url] = current_url
-                            else:
-                                url_sources[current_url] = source_url
+                            breaker.record_success(host)
                         
-                        # Skip non-HTML content types and binary files
-                        content_type = response.headers.get('Content-Type', '').lower()
-                        is_html = ('text/html' in content_type or 'application/xhtml+xml' in content_type)
+                            with found_lock:
+                                found_urls.add(current_url)
+                                # Set the source - if it's the start URL, it's its own source
+                                if source_url is None:
+                                    url_sources[current_url] = current_url
+                                else:
+                                    url_sources[current_url] = source_url
                         
-                        # Cache the content if it's HTML
-                        if is_html:
-                            self.cache_manager.cache_content(current_url, response.text, is_sitemap=False)
+                            # Skip non-HTML content types and binary files
+                            if not is_html_type(response.headers.get('Content-Type', '')):
+                                continue
                         
-                        if not is_html:
-                            url_queue.task_done()
-                            continue
-                            
-                        # Skip URLs with file extensions we want to avoid
-                        parsed_url = urlparse(current_url)
-                        path = parsed_url.path.lower()
-                        if any(path.endswith(ext) for ext in SKIP_EXTENSIONS):
-                            url_queue.task_done()
-                            continue
-                            
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                            # curl_cffi bodies are kept as raw bytes: the cache write
+                            # and the parser both accept them, so the body is never
+                            # decoded separately. obscura already hands back text.
+                            if not self.config.curl_cffi:
+                                body = response.text
                         
-                        # Find all links
-                        new_urls = []
-                        for link in soup.find_all('a', href=True):
-                            href = link['href']
-                            full_url = urljoin(current_url, href)
+                            # Cache the HTML content
+                            self.cache_manager.cache_content(current_url, body, is_sitemap=False)
                             
-                            # Skip non-HTTP URLs and external domains
-                            parsed_url = urlparse(full_url)
-                            if (parsed_url.scheme not in ('http', 'https') or
-                                parsed_url.netloc != base_domain):
+                            # Skip URLs with file extensions we want to avoid
+                            if has_skip_extension(_parse_url(current_url).path):
                                 continue
-
-                            # Remove fragments
-                            clean_url = full_url.split('#')[0]
-
-                            # Strip tracking query parameters (utm_*, fbclid, gclid, etc.)
-                            # before dedup so we don't crawl the same page multiple times
-                            clean_url = courlan.clean_url(clean_url)
-
-                            # Skip binary and non-HTML file types before adding to queue
-                            path = parsed_url.path.lower()
-                            if any(path.endswith(ext) for ext in SKIP_EXTENSIONS):
+                            
+                            # A body already parsed at this same path (a query-string
+                            # variant: session ids, print views) resolves to the same
+                            # links, which were queued the first time round
+                            body_bytes = body if isinstance(body, bytes) else body.encode('utf-8', 'surrogatepass')
+                            page_key = (hashlib.blake2b(body_bytes, digest_size=16).digest(),
+                                        current_url.partition('?')[0])
+                            if parsed_pages.setdefault(page_key, current_url) is not current_url:
+                                if verbose:
+                                    logging.info(f"Skipping link extraction for {current_url}: "
+                                                 f"same content as {parsed_pages[page_key]}")
                                 continue
                             
-                            with visited_lock:
-                                if clean_url not in visited_urls:
-                                    new_urls.append(clean_url)
-                                    # Track the source of this URL
-                                    if clean_url not in url_sources:
-                                        url_sources[clean_url] = current_url
+                            links = self.extract_links(body, current_url, base_domain)
+                        
+                            # Keep only links nobody has recorded yet. dict.setdefault is
+                            # atomic under the GIL, so recording the source and claiming
+                            # the URL happen in one step without visited_lock; only the
+                            # thread whose setdefault stored current_url enqueues it.
+                            new_urls = [
+                                url for url in links
+                                if url not in url_sources
+                                and url_sources.setdefault(url, current_url) is current_url
+                            ]
                         
-                        # Add new URLs to the queue with current_url as their source
-                        for url in new_urls:
-                            url_queue.put((url, current_url))
+                            # Queue the page's new URLs in one batch, current_url as their source
+                            url_queue.put_many((url, current_url) for url in new_urls)
                             
-                    except Exception as e:
-                        # Requeue failed URLs if they have retries left
-                        with attempts_lock:
-                            attempts = url_attempts.get(current_url, 0) + 1
-                            url_attempts[current_url] = attempts
-                        if attempts <= max_retries:
-                            if verbose:
-                                logging.warning(
-                                    f"Retrying {current_url} "
-                                    f"(attempt {attempts}/{max_retries}): {e}"
+                        except Exception as e:
+                            # Requeue failed URLs if they have retries left
+                            with attempts_lock:
+                                attempts = url_attempts.get(current_url, 0) + 1
+                                url_attempts[current_url] = attempts
+                            if breaker.record_failure(host):
+                                if breaker.given_up(host):
+                                    logging.warning(
+                                        f"{host} is still failing after {HOST_MAX_TRIPS} pauses, "
+                                        f"skipping its remaining URLs"
+                                    )
+                                else:
+                                    logging.warning(
+                                        f"{host} keeps failing, pausing requests to it for {HOST_COOLDOWN}s"
+                                    )
+                            if attempts <= max_retries:
+                                if verbose:
+                                    logging.warning(
+                                        f"Retrying {current_url} "
+                                        f"(attempt {attempts}/{max_retries}): {e}"
+                                    )
+                                # Un-visit it so the requeued entry isn't dropped as a duplicate
+                                with visited_lock:
+                                    visited_urls.discard(current_url)
+                                url_queue.put((current_url, source_url))
+                            elif verbose:
+                                logging.error(
+                                    f"Giving up on {current_url} "
+                                    f"after {max_retries} attempts: {e}"
                                 )
-                            url_queue.put((current_url, source_url))
-                        elif verbose:
-                            logging.error(
-                                f"Giving up on {current_url} "
-                                f"after {max_retries} attempts: {e}"
-                            )
                     
+                        finally:
+                            # Always mark the thread operation as complete
+                            self.thread_monitor.register_thread_end(thread_op_id)
                     finally:
-                        # Always mark the thread operation as complete
-                        self.thread_monitor.register_thread_end(thread_op_id)
+                        # Mark the item done only after any links/retries were queued,
+                        # so the frontier never looks finished while work remains
                         url_queue.task_done()
                     
                 except Exception as e:
@@ -1049,7 +1828,7 @@ class WebsiteSpider:
         
         try:
             # Create and start worker threads.
-            # Workers self-terminate when the queue is empty or interrupted.
+            # Workers exit as soon as the frontier is finished or interrupted.
             # The executor's context manager waits for all submitted tasks.
             with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
                 for _ in range(num_workers):
@@ -1105,10 +1884,13 @@ class WebsiteSpider:
         # Progress bar for non-verbose mode
         pbar = None
         if not self.verbose:
-            pbar = tqdm(total=total_urls, desc="Caching URLs", unit="urls")
+            pbar = tqdm(total=total_urls, desc="Caching URLs", unit="urls", mininterval=0.25)
         
         # Retry delays for exponential backoff
-        retry_delays = [2, 4, 8, 16, 32]
+        retry_delays = CURL_RETRY_DELAYS
+        # curl_cffi fetches in flight shrink when the server starts timing out
+        # or throttling; the cap is the pool size, so it only ever backs off
+        limiter = AdaptiveLimiter(num_workers)
         
         # Start the thread monitor
         self.thread_monitor.start_monitoring()
@@ -1124,38 +1906,39 @@ class WebsiteSpider:
             self.thread_monitor.register_thread_start(thread_op_id)
             
             try:
-                # Generate cache filename for checking
-                filename = self.cache_manager.url_to_filename(url) + ".html"
-                    
                 if self.config.curl_cffi:
                     # Fallback: use curl_cffi with exponential backoff
                     for retry, delay in enumerate(retry_delays):
                         if self.interrupted:
                             return
+                        limiter.acquire()
                         try:
-                            response = requests.get(url, timeout=3)
-                            self.cache_manager.cache_content(url, response.text, is_sitemap=False)
-                            if self.verbose:
-                                logging.info(f"[tid={threading.get_ident()}] Successfully cached: {url}")
-                            break
+                            # Capped like spider pages, so an oversized file can't
+                            # balloon a worker's memory
+                            response, body = fetch_capped(self.session, url, timeout=3)
                         except Exception as e:
-                            error_message = str(e).lower()
-                            if any(err in error_message for err in [
-                                'connection reset', 'connection timed out', 'timeout',
-                                'recv failure', 'operation timed out'
-                            ]):
+                            connection_error = is_transient_error(e)
+                            # Only connection trouble says the server is struggling
+                            limiter.release(success=False if connection_error else None)
+                            if connection_error:
                                 if retry < len(retry_delays) - 1 and not self.interrupted:
+                                    wait = jittered(delay)
                                     if self.verbose:
-                                        logging.warning(f"Connection error caching {url}, retrying in {delay}s (attempt {retry+1}/{len(retry_delays)}): {e}")
-                                    time.sleep(delay)
+                                        logging.warning(f"Connection error caching {url}, retrying in {wait:.1f}s (attempt {retry+1}/{len(retry_delays)}): {e}")
+                                    self.stop_event.wait(wait)
                                     continue
                             if self.verbose:
                                 logging.error(f"Failed to cache {url}: {e}")
                             break
+                        limiter.release(success=response.status_code not in THROTTLE_STATUS_CODES)
+                        self.cache_manager.cache_content(url, body, is_sitemap=False)
+                        if self.verbose:
+                            logging.info(f"[tid={threading.get_ident()}] Successfully cached: {url}")
+                        break
                 else:
                     # Default: use obscura for JavaScript rendering
                     # Retry subprocess failures with short backoff.
-                    obscura_retries = [1, 2, 4]
+                    obscura_retries = OBSCURA_RETRY_DELAYS
                     for retry, delay in enumerate(obscura_retries):
                         if self.interrupted:
                             return
@@ -1173,12 +1956,13 @@ class WebsiteSpider:
                             break
                         except Exception as e:
                             if retry < len(obscura_retries) - 1 and not self.interrupted:
+                                wait = jittered(delay)
                                 if self.verbose:
                                     logging.warning(
                                         f"obscura error caching {url}, "
-                                        f"retrying in {delay}s (attempt {retry+1}/{len(obscura_retries)}): {e}"
+                                        f"retrying in {wait:.1f}s (attempt {retry+1}/{len(obscura_retries)}): {e}"
                                     )
-                                time.sleep(delay)
+                                self.stop_event.wait(wait)
                             else:
                                 if self.verbose:
                                     logging.error(f"Failed to cache {url}: {e}")
@@ -1202,6 +1986,8 @@ class WebsiteSpider:
                 # Wait for all tasks to complete or for interruption
                 for future in concurrent.futures.as_completed(futures):
                     if self.interrupted:
+                        # Drop queued URLs instead of starting each one just to return
+                        executor.shutdown(wait=False, cancel_futures=True)
                         break
                     try:
                         future.result()  # Get the result to catch any exceptions
@@ -1244,20 +2030,26 @@ class ReportGenerator:
             
         filepath = os.path.join(self.output_dir, filename)
         with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            for row in data:
-                writer.writerow(row)
+            f.writelines(format_csv_lines([headers]))
+            f.writelines(format_csv_lines(data))
                 
         if self.verbose:
             logging.info(f"Wrote {len(data)} rows to {filepath}")
         return filepath
         
-    def generate_comparison_reports(self, sitemap_urls, site_urls, sitemap_sources, site_sources, has_sitemap=True):
-        """Generate comparison reports between sitemap and site URLs."""
+    def generate_comparison_reports(self, sitemap_urls, site_urls, sitemap_sources, site_sources, has_sitemap=True,
+                                    unfetched_sources=None):
+        """Generate comparison reports between sitemap and site URLs.
+
+        URLs in unfetched_sources were never requested (their host was given
+        up on), so they are listed in unfetched_urls.csv rather than counted
+        as missing from the site.
+        """
+        unfetched_sources = unfetched_sources or {}
+        
         # Find differences
         in_site_not_sitemap = site_urls - sitemap_urls
-        in_sitemap_not_site = sitemap_urls - site_urls if has_sitemap else set()
+        in_sitemap_not_site = sitemap_urls - site_urls - unfetched_sources.keys() if has_sitemap else set()
         
         # Prepare data for reports
         missing_from_sitemap_data = [(site_sources.get(url, self.config.start_url), url) 
@@ -1288,6 +2080,10 @@ class ReportGenerator:
                          for url in sorted(site_urls)]
         self.write_csv_report("all_site_urls.csv", all_site_data)
         
+        # Write URLs skipped on hosts that kept failing
+        unfetched_data = [(unfetched_sources[url], url) for url in sorted(unfetched_sources)]
+        self.write_csv_report("unfetched_urls.csv", unfetched_data)
+        
         return in_site_not_sitemap, in_sitemap_not_site
 
 
@@ -1307,53 +2103,57 @@ class ComparisonAnalyzer:
         if not os.path.exists(sites_dir):
             return None
             
-        # Get all timestamp directories for this domain
-        timestamp_dirs = []
-        for dirname in os.listdir(sites_dir):
-            dir_path = os.path.join(sites_dir, dirname)
-            if os.path.isdir(dir_path) and dir_path != current_dir:
-                # Check if this directory has the required CSV files - only require all_site_urls.csv
-                if os.path.exists(os.path.join(dir_path, "all_site_urls.csv")):
-                    timestamp_dirs.append(dir_path)
-        
-        if not timestamp_dirs:
-            return None
-            
-        # Sort by modification time (most recent first)
-        timestamp_dirs.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return timestamp_dirs[0]
-        
-    def compare_csv_files(self, current_file, previous_file, output_file):
-        """Compare two CSV files and write differences to output file."""
-        # Read current CSV
-        current_urls = set()
-        with open(current_file, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            for row in reader:
-                if len(row) >= 2:
-                    current_urls.add(row[1])  # URL is in second column
+        # Scan directories are named by Config's timestamp, so the newest is
+        # found by parsing names; only names that don't parse need a stat
+        candidates = []
+        with os.scandir(sites_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.path == current_dir:
+                    continue
+                try:
+                    scanned_at = datetime.datetime.strptime(entry.name, "%m-%d-%Y_%I-%M%p").timestamp()
+                except ValueError:
+                    scanned_at = entry.stat().st_mtime
+                candidates.append((scanned_at, entry.path))
+        
+        # Most recent first; the first one with results is the previous scan
+        # (only all_site_urls.csv is required)
+        for _, dir_path in sorted(candidates, reverse=True):
+            if os.path.exists(os.path.join(dir_path, "all_site_urls.csv")):
+                return dir_path
+        return None
         
-        # Read previous CSV
-        previous_urls = set()
-        with open(previous_file, 'r', newline='') as f:
+    def iter_url_column(self, csv_file):
+        """Yield the URLs (second column) of a results CSV, skipping the header."""
+        with open(csv_file, 'r', newline='') as f:
             reader = csv.reader(f)
-            next(reader)  # Skip header
+            next(reader, None)  # Skip header
             for row in reader:
                 if len(row) >= 2:
-                    previous_urls.add(row[1])  # URL is in second column
+                    yield row[1]
+
+    def read_url_column(self, csv_file):
+        """Return the set of URLs (second column) in a results CSV, skipping the header."""
+        return set(self.iter_url_column(csv_file))
+
+    def compare_csv_files(self, current_file, previous_file, output_file, current_urls=None):
+        """Compare two CSV files and write differences to output file.
+
+        If the caller still holds the current URLs in memory it can pass them
+        as current_urls, and only the previous CSV is read.
+        """
+        if current_urls is None:
+            current_urls = self.read_url_column(current_file)
+        
+        previous_urls = self.read_url_column(previous_file)
         
         # Find new and fixed issues
         new_issues = current_urls - previous_urls
         fixed_issues = previous_urls - current_urls
         
         # Prepare data for report
-        comparison_data = []
-        for url in sorted(new_issues):
-            comparison_data.append(["New", url])
-            
-        for url in sorted(fixed_issues):
-            comparison_data.append(["Fixed", url])
+        comparison_data = [["New", url] for url in sorted(new_issues)]
+        comparison_data.extend(["Fixed", url] for url in sorted(fixed_issues))
         
         # Write comparison results
         self.report_generator.write_csv_report(os.path.basename(output_file), comparison_data, ["Status", "URL"])
@@ -1365,8 +2165,12 @@ class ComparisonAnalyzer:
         
         return len(new_issues), len(fixed_issues)
         
-    def compare_with_previous(self):
-        """Compare current scan with previous scan."""
+    def compare_with_previous(self, missing_from_site=None, missing_from_sitemap=None):
+        """Compare current scan with previous scan.
+
+        missing_from_site / missing_from_sitemap are this run's URL sets, if
+        still in memory; otherwise the current CSVs are read back.
+        """
         previous_dir = self.find_previous_scan()
         
         if not previous_dir:
@@ -1387,7 +2191,7 @@ class ComparisonAnalyzer:
         comparison_missing_site = os.path.join(self.output_dir, "comparison_missing_from_site.csv")
         
         new_missing_site, fixed_missing_site = self.compare_csv_files(
-            current_missing_site, previous_missing_site, comparison_missing_site)
+            current_missing_site, previous_missing_site, comparison_missing_site, missing_from_site)
         
         # Compare missing from sitemap
         current_missing_sitemap = os.path.join(self.output_dir, "missing_from_sitemap.csv")
@@ -1395,7 +2199,7 @@ class ComparisonAnalyzer:
         comparison_missing_sitemap = os.path.join(self.output_dir, "comparison_missing_from_sitemap.csv")
         
         new_missing_sitemap, fixed_missing_sitemap = self.compare_csv_files(
-            current_missing_sitemap, previous_missing_sitemap, comparison_missing_sitemap)
+            current_missing_sitemap, previous_missing_sitemap, comparison_missing_sitemap, missing_from_sitemap)
         
         if self.verbose:
             logging.info("Comparison with previous scan complete")
@@ -1418,11 +2222,12 @@ class SitemapComparison:
         if self.config.verbose:
             logging.info(f"Created output directory: {self.config.output_dir}")
             
-        # Initialize components
+        # Initialize components. All curl_cffi fetches share one session.
+        self.session = open_session(self.config.start_url, self.config.verbose)
         self.cache_manager = CacheManager(self.config)
         self.url_processor = UrlProcessor(self.config)
-        self.sitemap_fetcher = SitemapFetcher(self.config, self.cache_manager, self.url_processor)
-        self.website_spider = WebsiteSpider(self.config, self.cache_manager, self.url_processor)
+        self.sitemap_fetcher = SitemapFetcher(self.config, self.cache_manager, self.url_processor, self.session)
+        self.website_spider = WebsiteSpider(self.config, self.cache_manager, self.url_processor, self.session)
         self.report_generator = ReportGenerator(self.config)
         self.comparison_analyzer = ComparisonAnalyzer(self.config, self.report_generator)
         
@@ -1464,14 +2269,9 @@ class SitemapComparison:
                 has_sitemap = True
             
             # Filter and normalize sitemap URLs
-            normalized_sitemap_urls = set()
-            normalized_sitemap_sources = {}
-            
-            for url in sitemap_urls_raw:
-                if self.url_processor.is_valid_url(url):
-                    normalized_url = self.url_processor.normalize_url(url)
-                    normalized_sitemap_urls.add(normalized_url)
-                    normalized_sitemap_sources[normalized_url] = sitemap_sources.get(url, sitemap_url if sitemap_url else self.config.start_url)
+            normalized_sitemap_sources = self.url_processor.normalize_with_sources(
+                sitemap_urls_raw, sitemap_sources, sitemap_url if sitemap_url else self.config.start_url)
+            normalized_sitemap_urls = set(normalized_sitemap_sources)
             
             if has_sitemap:
                 if self.config.verbose:
@@ -1488,22 +2288,20 @@ class SitemapComparison:
                 return
             
             # Filter and normalize site URLs
-            normalized_site_urls = set()
-            normalized_site_sources = {}
-            
-            for url in site_urls_raw:
-                if self.url_processor.is_valid_url(url):
-                    normalized_url = self.url_processor.normalize_url(url)
-                    normalized_site_urls.add(normalized_url)
-                    normalized_site_sources[normalized_url] = site_sources.get(url, self.config.start_url)
+            normalized_site_sources = self.url_processor.normalize_with_sources(
+                site_urls_raw, site_sources, self.config.start_url)
+            normalized_site_urls = set(normalized_site_sources)
+            unfetched_sources = self.url_processor.normalize_with_sources(
+                self.website_spider.unfetched_urls, self.website_spider.unfetched_urls, self.config.start_url)
                     
             if self.config.verbose:
                 logging.info(f"After filtering and normalization, found {len(normalized_site_urls)} valid URLs from spidering")
             else:
                 print(f"Found {len(normalized_site_urls)} valid URLs from spidering")
             
-            # Apply additional filtering based on configuration
-            filtered_site_urls = normalized_site_urls.copy()
+            # Apply additional filtering based on configuration. The filters
+            # below build new sets, so the normalized set needs no copy.
+            filtered_site_urls = normalized_site_urls
             
             # Apply pagination filtering if requested
             if self.config.ignore_pagination:
@@ -1531,13 +2329,20 @@ class SitemapComparison:
             in_site_not_sitemap, in_sitemap_not_site = self.report_generator.generate_comparison_reports(
                 normalized_sitemap_urls, filtered_site_urls, 
                 normalized_sitemap_sources, normalized_site_sources,
-                has_sitemap)
+                has_sitemap, unfetched_sources)
                 
             # Print summary
             if not self.config.verbose:
                 print(f"Found {len(in_site_not_sitemap)} URLs missing from sitemap")
                 if has_sitemap:
                     print(f"Found {len(in_sitemap_not_site)} URLs missing from site")
+            if unfetched_sources:
+                message = (f"Skipped {len(unfetched_sources)} URLs on hosts that kept failing "
+                           f"(listed in unfetched_urls.csv)")
+                if self.config.verbose:
+                    logging.warning(message)
+                else:
+                    print(message)
             
             # Cache pages that are in sitemap but not found by site spider.
             # Respect --max-pages so a quick test run doesn't spend 25 minutes caching.
@@ -1556,7 +2361,12 @@ class SitemapComparison:
             
             # Compare with previous scan if requested
             if self.config.compare_previous:
-                self.comparison_analyzer.compare_with_previous()
+                # Reuse this run's sets instead of re-reading the CSVs just written.
+                # Without a sitemap, missing_from_site.csv holds a placeholder
+                # row, so that file is still read back.
+                self.comparison_analyzer.compare_with_previous(
+                    missing_from_site=in_sitemap_not_site if has_sitemap else None,
+                    missing_from_sitemap=in_site_not_sitemap)
             
             # Compress output files
             self.cache_manager.copy_output_files()
@@ -1574,6 +2384,7 @@ class SitemapComparison:
                 logging.error(traceback.format_exc())
             return 1
         finally:
+            self.session.close()
             if self.interrupted:
                 if self.config.verbose:
                     logging.info("Process interrupted by user. Exiting...")
@@ -1614,8 +2425,14 @@ def main():
                         help='Subprocess timeout for each obscura call in seconds (default: nav-timeout x 1.5, min +1s)')
     parser.add_argument('--obscura-stealth-disable', action='store_true',
                         help='Disable obscura stealth mode (stealth is ON by default)')
+    parser.add_argument('--discovery-cache', action='store_true',
+                        help='Reuse a sitemap location discovered in the last 24 hours (kept in sites/<domain>/)')
+    parser.add_argument('--sitemap-cache', action='store_true',
+                        help='Save sitemaps under sites/<domain>/ and revalidate them with conditional GETs on later runs')
     parser.add_argument('--curl-cffi', action='store_true',
                         help='Use curl_cffi instead of obscura for crawling and caching (fallback)')
+    parser.add_argument('--gzip-cache', action='store_true',
+                        help='Store cached pages and sitemaps gzip-compressed (.html.gz / .xml.gz)')
     args = parser.parse_args()
 
     # Set up logging
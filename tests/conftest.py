@@ -29,6 +29,8 @@ def sample_args():
         obscura_timeout=None,
         obscura_stealth_disable=False,
         curl_cffi=False,
+        discovery_cache=False,
+        sitemap_cache=False,
     )
 
 
@@ -0,0 +1,56 @@
+"""Tests for AdaptiveLimiter — AIMD concurrency control for cache fetches."""
+import threading
+import time
+import pytest
+from sitemap_comparison import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter:
+    """Additive increase on success, multiplicative decrease on failure."""
+
+    def test_failure_halves_limit(self):
+        limiter = AdaptiveLimiter(8)
+        limiter.acquire()
+        limiter.release(success=False)
+        assert limiter.limit == 4
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(success=False)
+        assert limiter.limit == 1  # never below the minimum
+
+    def test_success_grows_back_to_starting_limit(self):
+        limiter = AdaptiveLimiter(4)
+        limiter.acquire()
+        limiter.release(success=False)
+        assert limiter.limit == 2
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(success=True)
+        assert limiter.limit == 4
+
+    def test_neutral_release_keeps_limit(self):
+        limiter = AdaptiveLimiter(4)
+        limiter.acquire()
+        limiter.release(success=False)
+        limiter.acquire()
+        limiter.release(success=None)
+        assert limiter.limit == 2
+
+    def test_never_above_starting_limit(self):
+        limiter = AdaptiveLimiter(4)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(success=True)
+        assert limiter.limit == 4
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AdaptiveLimiter(1)
+        limiter.acquire()
+        acquired = threading.Event()
+        worker = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        worker.start()
+        time.sleep(0.05)
+        assert not acquired.is_set()
+        limiter.release(success=True)
+        worker.join(timeout=2)
+        assert acquired.is_set()
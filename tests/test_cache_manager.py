@@ -87,9 +87,87 @@ class TestCopyOutputFiles:
         assert os.path.isdir(results_dir)
         assert os.path.exists(os.path.join(results_dir, "all_site_urls.csv"))
 
+    def test_results_are_independent_copies(self, sample_config, tmp_path):
+        """Rewriting a top-level CSV in place leaves the results/ copy untouched."""
+        sample_config.output_dir = str(tmp_path)
+        cm = CacheManager(sample_config)
+        src = os.path.join(str(tmp_path), "all_site_urls.csv")
+        with open(src, "w") as f:
+            f.write("Source,URL\n")
+        assert cm.copy_output_files() is True
+        with open(src, "w") as f:
+            f.write("rewritten\n")
+
+        with open(os.path.join(str(tmp_path), "results", "all_site_urls.csv")) as f:
+            assert f.read() == "Source,URL\n"
+
+    def test_rerun_replaces_existing(self, sample_config, tmp_path):
+        sample_config.output_dir = str(tmp_path)
+        cm = CacheManager(sample_config)
+        src = os.path.join(str(tmp_path), "all_site_urls.csv")
+        with open(src, "w") as f:
+            f.write("old\n")
+        cm.copy_output_files()
+        os.remove(src)
+        with open(src, "w") as f:
+            f.write("new\n")
+
+        assert cm.copy_output_files() is True
+        with open(os.path.join(str(tmp_path), "results", "all_site_urls.csv")) as f:
+            assert f.read() == "new\n"
+
     def test_no_files(self, sample_config, tmp_path):
         sample_config.output_dir = str(tmp_path)
         cm = CacheManager(sample_config)
         # No CSV files exist — should not crash
         result = cm.copy_output_files()
         assert result is False
+
+
+class TestCacheContentBytes:
+    """Raw response bytes are written without a decode/encode round trip."""
+
+    def test_bytes_written_verbatim(self, sample_config, tmp_path):
+        sample_config.output_dir = str(tmp_path)
+        cm = CacheManager(sample_config)
+        content = "<html><body>café</body></html>".encode("latin-1")
+        cm.cache_content("https://www.example.com/page", content, is_sitemap=False)
+
+        cache_dir = os.path.join(str(tmp_path), "cache")
+        filepath = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(filepath, "rb") as f:
+            assert f.read() == content
+
+
+class TestGzipCache:
+    """--gzip-cache writes compressed .gz files holding the same bytes."""
+
+    @pytest.mark.parametrize("content", ["<html>caf\u00e9</html>", b"<urlset></urlset>"])
+    def test_round_trip(self, sample_config, tmp_path, content):
+        import gzip
+        sample_config.output_dir = str(tmp_path)
+        sample_config.gzip_cache = True
+        cm = CacheManager(sample_config)
+        is_sitemap = isinstance(content, bytes)
+        cm.cache_content("https://www.example.com/page", content, is_sitemap=is_sitemap)
+
+        cache_dir = os.path.join(str(tmp_path), "cache-xml" if is_sitemap else "cache")
+        [name] = os.listdir(cache_dir)
+        assert name.endswith(".xml.gz" if is_sitemap else ".html.gz")
+        with gzip.open(os.path.join(cache_dir, name), "rb") as f:
+            expected = content if is_sitemap else content.encode("utf-8")
+            assert f.read() == expected
+
+
+class TestCacheDirectoryCreation:
+    """Each cache directory is created once, not on every write."""
+
+    def test_makedirs_once_per_directory(self, sample_config, tmp_path, mocker):
+        sample_config.output_dir = str(tmp_path)
+        cm = CacheManager(sample_config)
+        makedirs = mocker.spy(os, "makedirs")
+        for i in range(3):
+            cm.cache_content(f"https://www.example.com/p{i}", "<html></html>", is_sitemap=False)
+        cm.cache_content("https://www.example.com/sitemap.xml", "<urlset/>", is_sitemap=True)
+        assert makedirs.call_count == 2
+        assert len(os.listdir(os.path.join(str(tmp_path), "cache"))) == 3
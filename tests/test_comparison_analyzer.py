@@ -78,6 +78,58 @@ class TestCompareCsvFiles:
         assert new_count == 2
         assert fixed_count == 0
 
+    def test_unsorted_files_compared(self, comparison_analyzer, tmp_path):
+        current_file = os.path.join(str(tmp_path), "current.csv")
+        previous_file = os.path.join(str(tmp_path), "previous.csv")
+        output_file = os.path.join(str(tmp_path), "comparison.csv")
+        _write_csv(current_file, ["https://example.com/c", "https://example.com/a"])
+        _write_csv(previous_file, ["https://example.com/d", "https://example.com/a"])
+
+        assert comparison_analyzer.compare_csv_files(current_file, previous_file, output_file) == (1, 1)
+        with open(output_file, newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        assert rows == [["New", "https://example.com/c"], ["Fixed", "https://example.com/d"]]
+
+
+class TestInMemoryCurrentUrls:
+    """Passing this run's URL set skips reading the current CSV."""
+
+    def test_current_file_not_read(self, comparison_analyzer, tmp_path):
+        previous_file = os.path.join(str(tmp_path), "previous.csv")
+        output_file = os.path.join(str(tmp_path), "comparison.csv")
+        _write_csv(previous_file, ["https://example.com/a", "https://example.com/d"])
+        current = {"https://example.com/c", "https://example.com/a", "https://example.com/b"}
+
+        counts = comparison_analyzer.compare_csv_files(
+            os.path.join(str(tmp_path), "does-not-exist.csv"), previous_file, output_file, current
+        )
+        assert counts == (2, 1)
+        with open(output_file, newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        assert rows == [["New", "https://example.com/b"], ["New", "https://example.com/c"],
+                        ["Fixed", "https://example.com/d"]]
+
+
+class TestReadUrlColumn:
+    """URLs are read from the second column; header and short rows are skipped."""
+
+    def test_reads_urls(self, comparison_analyzer, tmp_path):
+        path = os.path.join(str(tmp_path), "urls.csv")
+        _write_csv(path, ["https://example.com/a", "https://example.com/b", "https://example.com/a"])
+        assert comparison_analyzer.read_url_column(path) == {
+            "https://example.com/a", "https://example.com/b"
+        }
+
+    def test_empty_and_short_rows(self, comparison_analyzer, tmp_path):
+        empty = os.path.join(str(tmp_path), "empty.csv")
+        open(empty, "w").close()
+        assert comparison_analyzer.read_url_column(empty) == set()
+
+        short = os.path.join(str(tmp_path), "short.csv")
+        with open(short, "w") as f:
+            f.write("Source,URL\nonly-one-column\n")
+        assert comparison_analyzer.read_url_column(short) == set()
+
 
 class TestFindPreviousScan:
     """Discovery of the most recent previous scan directory."""
@@ -102,6 +154,20 @@ class TestFindPreviousScan:
         # If current output_dir is inside tmp_path, the prev_dir at tmp_path.parent/sites/ is separate
         assert result is None or os.path.isdir(result)
 
+    def test_newest_by_directory_name(self, comparison_analyzer, tmp_path, monkeypatch):
+        """Scans are ordered by the timestamp in their name, not by mtime."""
+        monkeypatch.chdir(tmp_path)
+        sites_dir = os.path.join("sites", "www.example.com")
+        for name in ["12-31-2019_11-59pm", "01-02-2020_09-15am", "01-02-2020_10-00am"]:
+            os.makedirs(os.path.join(sites_dir, name))
+        # The newest scan has no results, and the oldest was touched last
+        _write_csv(os.path.join(sites_dir, "12-31-2019_11-59pm", "all_site_urls.csv"), [])
+        _write_csv(os.path.join(sites_dir, "01-02-2020_09-15am", "all_site_urls.csv"), [])
+        os.utime(os.path.join(sites_dir, "12-31-2019_11-59pm"), (2e9, 2e9))
+
+        result = comparison_analyzer.find_previous_scan()
+        assert result == os.path.join(sites_dir, "01-02-2020_09-15am")
+
     def test_no_comparison_without_previous(self, comparison_analyzer):
         """Returns False when no previous scan is available."""
         # current output_dir has no previous scan peer
@@ -1,5 +1,6 @@
 """Tests for Config — argument parsing and attribute defaults."""
 import argparse
+import os
 import pytest
 from sitemap_comparison import Config
 
@@ -123,3 +124,31 @@ class TestConfigDefaults:
         )
         config = Config(args)
         assert config.curl_cffi is True
+
+    def test_discovery_cache_flag(self):
+        """--discovery-cache keeps the remembered sitemap location under sites/<domain>/."""
+        args = argparse.Namespace(
+            start_url="https://www.example.com",
+            sitemap_url=None, output_prefix="", workers=4, max_pages=100,
+            verbose=False, compare_previous=False, ignore_pagination=False,
+            ignore_categories_tags=False, thread_timeout=30,
+            obscura_path="obscura", obscura_wait=1, obscura_wait_until="load",
+            obscura_timeout=None, obscura_stealth_disable=False, curl_cffi=False,
+        )
+        assert Config(args).discovery_cache is None
+        args.discovery_cache = True
+        assert Config(args).discovery_cache == os.path.join("sites", "www.example.com", "discovery.json")
+
+    def test_sitemap_cache_flag(self):
+        """--sitemap-cache keeps saved sitemaps under sites/<domain>/."""
+        args = argparse.Namespace(
+            start_url="https://www.example.com",
+            sitemap_url=None, output_prefix="", workers=4, max_pages=100,
+            verbose=False, compare_previous=False, ignore_pagination=False,
+            ignore_categories_tags=False, thread_timeout=30,
+            obscura_path="obscura", obscura_wait=1, obscura_wait_until="load",
+            obscura_timeout=None, obscura_stealth_disable=False, curl_cffi=False,
+        )
+        assert Config(args).sitemap_cache is None
+        args.sitemap_cache = True
+        assert Config(args).sitemap_cache == os.path.join("sites", "www.example.com", "sitemap-cache")
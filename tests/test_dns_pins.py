@@ -0,0 +1,65 @@
+"""Tests for build_dns_pins and open_session — the run's shared curl session."""
+import socket
+import pytest
+from curl_cffi import CurlHttpVersion
+from sitemap_comparison import build_dns_pins, open_session
+
+
+class TestBuildDnsPins:
+    """The start host is resolved once into curl RESOLVE entries."""
+
+    def test_default_ports(self, mocker):
+        mocker.patch("sitemap_comparison.socket.getaddrinfo", return_value=[
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 0)),
+        ])
+        pins = build_dns_pins("https://www.example.com/about")
+        assert pins == [
+            "www.example.com:80:93.184.216.34",
+            "www.example.com:443:93.184.216.34",
+        ]
+
+    def test_explicit_port(self, mocker):
+        mocker.patch("sitemap_comparison.socket.getaddrinfo", return_value=[
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.5", 0)),
+        ])
+        assert build_dns_pins("http://intranet.local:8080/") == ["intranet.local:8080:10.0.0.5"]
+
+    def test_all_addresses_pinned(self, mocker):
+        """IPv6 and IPv4 addresses are all pinned, IPv6 in brackets, duplicates dropped."""
+        mocker.patch("sitemap_comparison.socket.getaddrinfo", return_value=[
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2606:2800:220:1::1", 0, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 0)),
+        ])
+        assert build_dns_pins("https://www.example.com/") == [
+            "www.example.com:80:[2606:2800:220:1::1],93.184.216.34",
+            "www.example.com:443:[2606:2800:220:1::1],93.184.216.34",
+        ]
+
+    def test_ipv6_only_host(self, mocker):
+        mocker.patch("sitemap_comparison.socket.getaddrinfo", return_value=[
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::5", 0, 0, 0)),
+        ])
+        assert build_dns_pins("https://v6.example.com/") == [
+            "v6.example.com:80:[2001:db8::5]",
+            "v6.example.com:443:[2001:db8::5]",
+        ]
+
+    def test_ip_literal_not_pinned(self):
+        assert build_dns_pins("http://127.0.0.1:8000/") == []
+        assert build_dns_pins("http://[::1]:8000/") == []
+
+    def test_resolution_failure(self, mocker):
+        mocker.patch("sitemap_comparison.socket.getaddrinfo", side_effect=socket.gaierror("no such host"))
+        assert build_dns_pins("https://does-not-exist.invalid/") == []
+
+    def test_no_host(self):
+        assert build_dns_pins("not a url") == []
+
+
+class TestOpenSession:
+    """The shared session asks for HTTP/2 over TLS."""
+
+    def test_http2_over_tls(self):
+        session = open_session("http://127.0.0.1:8000/")
+        assert session.http_version == CurlHttpVersion.V2TLS
@@ -0,0 +1,70 @@
+"""Tests for HostCircuitBreaker — pausing a failing host with a half-open trial."""
+import time
+import pytest
+from sitemap_comparison import HostCircuitBreaker
+
+HOST = "www.example.com"
+
+
+def trip(breaker):
+    for _ in range(breaker.limit):
+        breaker.record_failure(HOST)
+
+
+class TestHostCircuitBreaker:
+    """Consecutive failures pause a host; one trial request decides what's next."""
+
+    def test_closed_until_limit(self):
+        breaker = HostCircuitBreaker(limit=3, cooldown=60, max_trips=2)
+        assert breaker.record_failure(HOST) is False
+        assert breaker.record_failure(HOST) is False
+        assert breaker.wait_time(HOST) == 0
+        assert breaker.record_failure(HOST) is True
+        assert breaker.wait_time(HOST) > 0
+
+    def test_success_resets_count(self):
+        breaker = HostCircuitBreaker(limit=3, cooldown=60, max_trips=2)
+        breaker.record_failure(HOST)
+        breaker.record_failure(HOST)
+        breaker.record_success(HOST)
+        assert breaker.record_failure(HOST) is False
+        assert breaker.wait_time(HOST) == 0
+
+    def test_single_trial_after_cooldown(self):
+        breaker = HostCircuitBreaker(limit=2, cooldown=0.05, max_trips=3)
+        trip(breaker)
+        time.sleep(0.06)
+        assert breaker.wait_time(HOST) == 0  # this caller gets the trial
+        assert breaker.wait_time(HOST) > 0   # everyone else keeps waiting
+
+    def test_trial_success_closes(self):
+        breaker = HostCircuitBreaker(limit=2, cooldown=0.05, max_trips=3)
+        trip(breaker)
+        time.sleep(0.06)
+        assert breaker.wait_time(HOST) == 0
+        breaker.record_success(HOST)
+        assert breaker.wait_time(HOST) == 0
+        assert breaker.wait_time(HOST) == 0
+
+    def test_trial_failure_reopens(self):
+        breaker = HostCircuitBreaker(limit=2, cooldown=0.05, max_trips=3)
+        trip(breaker)
+        time.sleep(0.06)
+        assert breaker.wait_time(HOST) == 0
+        assert breaker.record_failure(HOST) is True
+        assert breaker.wait_time(HOST) > 0
+        assert not breaker.given_up(HOST)
+
+    def test_given_up_after_max_trips(self):
+        breaker = HostCircuitBreaker(limit=2, cooldown=0.01, max_trips=2)
+        trip(breaker)
+        time.sleep(0.02)
+        assert breaker.wait_time(HOST) == 0
+        breaker.record_failure(HOST)
+        assert breaker.given_up(HOST)
+        assert breaker.wait_time(HOST) is None
+
+    def test_hosts_independent(self):
+        breaker = HostCircuitBreaker(limit=2, cooldown=60, max_trips=2)
+        trip(breaker)
+        assert breaker.wait_time("other.example.com") == 0
@@ -1,8 +1,9 @@
 """Tests for ReportGenerator — CSV report generation and comparison."""
+import io
 import os
 import csv
 import pytest
-from sitemap_comparison import ReportGenerator
+from sitemap_comparison import ReportGenerator, format_csv_lines
 
 
 @pytest.fixture
@@ -11,6 +12,26 @@ def report_gen(sample_config, tmp_path):
     return ReportGenerator(sample_config)
 
 
+class TestFormatCsvLines:
+    """Fast-path CSV lines are byte-identical to csv.writer output."""
+
+    @pytest.mark.parametrize("row", [
+        ("https://source.com", "https://example.com/page1"),
+        ("No sitemap found", ""),
+        ("", ""),
+        ("https://source.com", "https://example.com/a,b"),
+        ("https://source.com", 'https://example.com/"quoted"'),
+        ("https://source.com", "https://example.com/line\nbreak"),
+        ("",),
+        (),
+        ("count", 3),
+    ])
+    def test_matches_csv_writer(self, row):
+        expected = io.StringIO()
+        csv.writer(expected).writerow(row)
+        assert list(format_csv_lines([row])) == [expected.getvalue()]
+
+
 class TestWriteCsvReport:
     """CSV files are written with correct headers and data."""
 
@@ -98,3 +119,20 @@ class TestGenerateComparisonReports:
 
         assert in_site_not_sitemap == set()
         assert in_sitemap_not_site == set()
+
+    def test_unfetched_urls_reported_separately(self, report_gen):
+        """URLs never fetched are listed on their own, not as missing from site."""
+        sitemap_urls = {"https://www.example.com/a", "https://www.example.com/b"}
+        site_urls = {"https://www.example.com/a"}
+        sources = {u: "https://www.example.com" for u in sitemap_urls}
+        unfetched = {"https://www.example.com/b": "https://www.example.com/a"}
+
+        _, in_sitemap_not_site = report_gen.generate_comparison_reports(
+            sitemap_urls, site_urls, sources, sources, has_sitemap=True,
+            unfetched_sources=unfetched,
+        )
+
+        assert in_sitemap_not_site == set()
+        with open(os.path.join(report_gen.output_dir, "unfetched_urls.csv")) as f:
+            rows = list(csv.reader(f))
+        assert rows[1] == ["https://www.example.com/a", "https://www.example.com/b"]
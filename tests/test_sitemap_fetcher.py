@@ -1,6 +1,7 @@
 """Tests for SitemapFetcher — URL extraction from sitemap XML and HTML."""
 import pytest
-from sitemap_comparison import SitemapFetcher, CacheManager
+import xml.etree.ElementTree as ET
+from sitemap_comparison import SitemapFetcher, CacheManager, iterparse_sitemap_locs
 
 
 SITEMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
@@ -66,7 +67,7 @@ class TestGetSitemapUrls:
     """Full sitemap URL extraction with mocked HTTP."""
 
     def test_simple_sitemap(self, sitemap_fetcher, mocker):
-        mock_get = mocker.patch("sitemap_comparison.requests.get")
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
         mock_get.return_value = mocker.Mock(
             text=SITEMAP_XML,
             status_code=200,
@@ -78,9 +79,21 @@ class TestGetSitemapUrls:
         assert "https://www.example.com/page2" in urls
         assert len(urls) == 2
 
+    def test_cdata_locs_parsed_by_elementtree(self, sitemap_fetcher, mocker):
+        """CDATA-wrapped <loc> values fall through to the XML parser intact."""
+        xml = ('<?xml version="1.0" encoding="UTF-8"?>'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+               '<url><loc><![CDATA[https://www.example.com/a?x=1&y=2]]></loc></url>'
+               '</urlset>')
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
+        mock_get.return_value = mocker.Mock(text=xml, status_code=200)
+
+        urls, _ = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.xml")
+        assert urls == {"https://www.example.com/a?x=1&y=2"}
+
     def test_sitemap_index_recursion(self, sitemap_fetcher, mocker):
         """Sitemap index triggers recursive fetch of sub-sitemaps."""
-        mock_get = mocker.patch("sitemap_comparison.requests.get")
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
         # First call: sitemap index, second: sub-sitemap
         mock_get.side_effect = [
             mocker.Mock(text=SITEMAP_INDEX_XML, status_code=200,
@@ -95,9 +108,29 @@ class TestGetSitemapUrls:
         # 2 sub-sitemaps × 2 URLs each = 4 unique URLs
         assert len(urls) == 2  # SITEMAP_XML has 2 unique URLs
 
+    def test_sub_sitemaps_fetched_concurrently(self, sitemap_fetcher, mocker):
+        """Both sub-sitemaps of an index are in flight at the same time."""
+        import threading
+        both_in_flight = threading.Barrier(2, timeout=5)
+        pages = {
+            "https://www.example.com/sitemap-posts.xml": "https://www.example.com/post",
+            "https://www.example.com/sitemap-pages.xml": "https://www.example.com/page",
+        }
+
+        def fake_get(url, **kwargs):
+            if url in pages:
+                both_in_flight.wait()  # raises BrokenBarrierError if fetched one at a time
+                return mocker.Mock(status_code=200, text=f"<urlset><url><loc>{pages[url]}</loc></url></urlset>")
+            return mocker.Mock(status_code=200, text=SITEMAP_INDEX_XML)
+
+        mocker.patch.object(sitemap_fetcher.session, "get", side_effect=fake_get)
+        urls, sources = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap-index.xml")
+        assert urls == set(pages.values())
+        assert sources["https://www.example.com/post"] == "https://www.example.com/sitemap-posts.xml"
+
     def test_visited_guard_prevents_recursion(self, sitemap_fetcher, mocker):
         """Self-referential sitemaps are visited only once."""
-        mock_get = mocker.patch("sitemap_comparison.requests.get")
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
         mock_get.return_value = mocker.Mock(
             text=SELF_REFERENTIAL_XML,
             status_code=200,
@@ -110,7 +143,7 @@ class TestGetSitemapUrls:
 
     def test_http_error_falls_through_to_regex(self, sitemap_fetcher, mocker):
         """When HTTP request fails, regex extraction is tried on any partial content."""
-        mock_get = mocker.patch("sitemap_comparison.requests.get")
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
         mock_get.side_effect = Exception("Connection refused")
 
         urls, sources = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.xml")
@@ -126,3 +159,221 @@ class TestGetSitemapUrls:
         urls = sitemap_fetcher.extract_urls_with_regex(content, "https://www.example.com/")
         assert "https://www.example.com/not-a-sitemap" in urls
         assert "https://www.example.com/actual-sitemap.xml" in urls
+
+
+class TestIterparseSitemapLocs:
+    """Streaming <loc> extraction from XML sitemaps."""
+
+    def test_urlset(self):
+        sitemaps, pages = iterparse_sitemap_locs(SITEMAP_XML)
+        assert sitemaps == []
+        assert pages == ["https://www.example.com/page1", "https://www.example.com/page2"]
+
+    def test_sitemap_index(self):
+        sitemaps, pages = iterparse_sitemap_locs(SITEMAP_INDEX_XML)
+        assert "https://www.example.com/sitemap-posts.xml" in sitemaps
+        assert pages == []
+
+    def test_bytes_honor_encoding_declaration(self):
+        xml = ('<?xml version="1.0" encoding="ISO-8859-1"?>'
+               '<urlset><url><loc> https://www.example.com/caf\xe9 </loc></url>'
+               '<url><loc></loc></url></urlset>').encode('latin-1')
+        assert iterparse_sitemap_locs(xml) == ([], ["https://www.example.com/caf\xe9"])
+
+    def test_malformed_raises_parse_error(self):
+        with pytest.raises(ET.ParseError):
+            iterparse_sitemap_locs("<urlset><url><loc>https://www.example.com/</url>")
+
+
+class TestDetectSitemapFormat:
+    """Content is routed to exactly one parser based on its leading bytes."""
+
+    @pytest.mark.parametrize("content, expected", [
+        (SITEMAP_XML, "xml"),
+        (SITEMAP_INDEX_XML, "xml"),
+        ("<urlset><url><loc>https://www.example.com/a</loc></url></urlset>", "xml"),
+        ("https://www.example.com/a\nhttps://www.example.com/b\n", "text"),
+        ("\n  https://www.example.com/a\n\nhttps://www.example.com/b", "text"),
+        ("https://www.example.com/a\nnot a url\n", "html"),
+        (MALFORMED_XML, "html"),
+        ("", "html"),
+    ])
+    def test_detect(self, sitemap_fetcher, content, expected):
+        assert sitemap_fetcher.detect_sitemap_format(content) == expected
+
+    def test_text_check_not_repeated(self, sitemap_fetcher, mocker):
+        """get_sitemap_urls hands its text_sitemap_urls result to format detection."""
+        content = "https://www.example.com/a\n<html><a href='/b'>b</a></html>"
+        mocker.patch.object(sitemap_fetcher, "fetch_sitemap", return_value=(content, content.encode()))
+        mocker.patch.object(sitemap_fetcher.cache_manager, "cache_content")
+        check = mocker.patch.object(sitemap_fetcher, "text_sitemap_urls", wraps=sitemap_fetcher.text_sitemap_urls)
+
+        sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.html")
+
+        check.assert_called_once_with(content)
+
+    def test_text_sitemap_urls(self, sitemap_fetcher):
+        content = "  https://www.example.com/a \r\n\nhttps://www.example.com/b\nhttps://www.example.com/a\n"
+        assert sitemap_fetcher.text_sitemap_urls(content) == {
+            "https://www.example.com/a", "https://www.example.com/b"}
+        assert sitemap_fetcher.text_sitemap_urls("https://www.example.com/a\nnot a url\n") is None
+        assert sitemap_fetcher.text_sitemap_urls(SITEMAP_XML) is None
+
+    def test_text_sitemap(self, sitemap_fetcher, mocker):
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
+        mock_get.return_value = mocker.Mock(
+            text="https://www.example.com/a\nhttps://www.example.com/b\n",
+            status_code=200,
+            raise_for_status=mocker.Mock(),
+        )
+
+        urls, sources = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.txt")
+        assert urls == {"https://www.example.com/a", "https://www.example.com/b"}
+        assert sources["https://www.example.com/a"] == "https://www.example.com/sitemap.txt"
+
+    def test_html_sitemap(self, sitemap_fetcher, mocker):
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
+        mock_get.return_value = mocker.Mock(
+            text='<html><body><a href="/about">About</a>'
+                 '<a href="https://other.com/x">Other</a></body></html>',
+            status_code=200,
+            raise_for_status=mocker.Mock(),
+        )
+
+        urls, sources = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.html")
+        assert urls == {"https://www.example.com/about"}
+
+    def test_html_sitemap_regex_fallback_when_parser_finds_nothing(self, sitemap_fetcher, mocker):
+        mocker.patch("sitemap_comparison.extract_hrefs", return_value=[])
+        mock_get = mocker.patch.object(sitemap_fetcher.session, "get")
+        mock_get.return_value = mocker.Mock(
+            text='<html><body><a href="https://www.example.com/about">About</a></body></html>',
+            status_code=200,
+            raise_for_status=mocker.Mock(),
+        )
+
+        urls, _ = sitemap_fetcher.get_sitemap_urls("https://www.example.com/sitemap.html")
+        assert urls == {"https://www.example.com/about"}
+
+
+class TestDiscoverSitemapUrl:
+    """Common sitemap locations are probed concurrently, in priority order."""
+
+    def test_earliest_location_wins(self, sitemap_fetcher, mocker):
+        import time
+        sitemap_fetcher.config.discovery_cache = None
+
+        def fake_get(url, **kwargs):
+            if url.endswith("/sitemap.xml"):
+                time.sleep(0.2)  # the preferred location answers last
+                return mocker.Mock(status_code=200, text=SITEMAP_XML)
+            if url.endswith("/wp-sitemap.xml"):
+                return mocker.Mock(status_code=200, text=SITEMAP_INDEX_XML)
+            return mocker.Mock(status_code=404, text="")
+
+        mocker.patch.object(sitemap_fetcher.session, "get", side_effect=fake_get)
+        assert sitemap_fetcher.discover_sitemap_url() == "https://www.example.com/sitemap.xml"
+
+    def test_nothing_found(self, sitemap_fetcher, mocker):
+        sitemap_fetcher.config.discovery_cache = None
+        mocker.patch.object(sitemap_fetcher.session, "get", side_effect=ConnectionError("refused"))
+        assert sitemap_fetcher.discover_sitemap_url() is None
+
+
+class TestDiscoveryCache:
+    """Discovered sitemap locations are remembered on disk between runs."""
+
+    @pytest.fixture
+    def cached_fetcher(self, sample_config, tmp_path):
+        from sitemap_comparison import UrlProcessor
+        sample_config.output_dir = str(tmp_path / "out")
+        sample_config.discovery_cache = str(tmp_path / "cache" / "discovery.json")
+        cm = CacheManager(sample_config)
+        return SitemapFetcher(sample_config, cm, UrlProcessor(sample_config))
+
+    def test_discovery_saved_and_reused(self, cached_fetcher, mocker):
+        mock_get = mocker.patch.object(cached_fetcher.session, "get")
+        mock_get.return_value = mocker.Mock(
+            status_code=200,
+            text="User-agent: *\nSitemap: https://www.example.com/wp-sitemap.xml\n",
+        )
+        assert cached_fetcher.discover_sitemap_url() == "https://www.example.com/wp-sitemap.xml"
+        assert mock_get.call_count == 1
+
+        mock_head = mocker.patch.object(cached_fetcher.session, "head")
+        mock_head.return_value = mocker.Mock(status_code=200)
+        assert cached_fetcher.discover_sitemap_url() == "https://www.example.com/wp-sitemap.xml"
+        # Second run: only a HEAD check, no robots.txt or probe GETs
+        assert mock_get.call_count == 1
+        mock_head.assert_called_once()
+
+    def test_stale_entry_ignored(self, cached_fetcher, mocker):
+        cached_fetcher.save_cached_sitemap_url("https://www.example.com", "https://www.example.com/old.xml")
+        mocker.patch("sitemap_comparison.time.time", return_value=4_000_000_000)
+        assert cached_fetcher.load_cached_sitemap_url("https://www.example.com") is None
+
+    @pytest.mark.parametrize("status", [404, 410, 403, 500, 503])
+    def test_non_2xx_invalidates(self, cached_fetcher, mocker, status):
+        cached_fetcher.save_cached_sitemap_url("https://www.example.com", "https://www.example.com/old.xml")
+        mocker.patch.object(cached_fetcher.session, "head", return_value=mocker.Mock(status_code=status))
+        assert cached_fetcher.load_cached_sitemap_url("https://www.example.com") is None
+
+    def test_corrupt_cache_file(self, cached_fetcher):
+        import os
+        os.makedirs(os.path.dirname(cached_fetcher.config.discovery_cache))
+        with open(cached_fetcher.config.discovery_cache, "w") as f:
+            f.write("{not json")
+        assert cached_fetcher.load_cached_sitemap_url("https://www.example.com") is None
+
+    def test_disabled(self, cached_fetcher):
+        cached_fetcher.config.discovery_cache = None
+        cached_fetcher.save_cached_sitemap_url("https://www.example.com", "https://www.example.com/sitemap.xml")
+        assert cached_fetcher.load_cached_sitemap_url("https://www.example.com") is None
+
+
+class TestSitemapRevalidation:
+    """Sitemaps saved by earlier runs are revalidated with conditional GETs."""
+
+    @pytest.fixture
+    def saving_fetcher(self, sample_config, tmp_path):
+        from sitemap_comparison import UrlProcessor
+        sample_config.output_dir = str(tmp_path / "out")
+        sample_config.sitemap_cache = str(tmp_path / "cache" / "sitemaps")
+        cm = CacheManager(sample_config)
+        return SitemapFetcher(sample_config, cm, UrlProcessor(sample_config))
+
+    def _response(self, mocker, status_code=200, body=b"", headers=None):
+        return mocker.Mock(status_code=status_code, content=body, text=body.decode("utf-8"),
+                           encoding="utf-8", headers=headers or {})
+
+    def test_not_modified_reuses_saved_body(self, saving_fetcher, mocker):
+        url = "https://www.example.com/sitemap.xml"
+        mock_get = mocker.patch.object(saving_fetcher.session, "get")
+        mock_get.return_value = self._response(
+            mocker, body=SITEMAP_XML.encode("utf-8"),
+            headers={"ETag": '"v1"', "Last-Modified": "Tue, 01 Sep 2026 00:00:00 GMT"})
+        assert saving_fetcher.fetch_sitemap(url)[0] == SITEMAP_XML
+
+        mock_get.return_value = self._response(mocker, status_code=304)
+        text, raw = saving_fetcher.fetch_sitemap(url)
+        assert text == SITEMAP_XML
+        assert raw == SITEMAP_XML.encode("utf-8")
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Sep 2026 00:00:00 GMT"}
+
+    def test_no_validators_not_saved(self, saving_fetcher, mocker):
+        url = "https://www.example.com/sitemap.xml"
+        mock_get = mocker.patch.object(saving_fetcher.session, "get")
+        mock_get.return_value = self._response(mocker, body=SITEMAP_XML.encode("utf-8"))
+        saving_fetcher.fetch_sitemap(url)
+        saving_fetcher.fetch_sitemap(url)
+        assert saving_fetcher.load_saved_sitemap(url) is None
+        assert mock_get.call_args.kwargs["headers"] is None
+
+    def test_disabled(self, saving_fetcher, mocker):
+        saving_fetcher.config.sitemap_cache = None
+        mock_get = mocker.patch.object(saving_fetcher.session, "get")
+        mock_get.return_value = self._response(mocker, body=b"https://www.example.com/a\n",
+                                               headers={"ETag": '"v1"'})
+        saving_fetcher.fetch_sitemap("https://www.example.com/sitemap.txt")
+        assert saving_fetcher.load_saved_sitemap("https://www.example.com/sitemap.txt") is None
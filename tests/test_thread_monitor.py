@@ -17,6 +17,16 @@ class TestThreadMonitor:
         tm.stop_monitoring()
         assert tm.monitor_running is False
 
+    def test_stop_wakes_monitor_immediately(self):
+        """Stopping doesn't wait out the monitor's one-second check interval."""
+        tm = ThreadMonitor(max_thread_time=5)
+        tm.start_monitoring()
+        time.sleep(0.05)
+        start = time.monotonic()
+        tm.stop_monitoring()
+        assert time.monotonic() - start < 0.5
+        assert not tm.monitor_thread.is_alive()
+
     def test_register_start_end(self):
         """Thread start/end times are tracked."""
         tm = ThreadMonitor(max_thread_time=5)
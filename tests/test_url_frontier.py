@@ -0,0 +1,103 @@
+"""Tests for UrlFrontier — the spider's shared work queue."""
+import threading
+import time
+import pytest
+from sitemap_comparison import UrlFrontier
+
+
+class TestUrlFrontier:
+    """FIFO semantics, timeouts, and cross-thread wake-ups."""
+
+    def test_fifo_order(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/a", None))
+        frontier.put(("https://www.example.com/b", "https://www.example.com/a"))
+        assert frontier.qsize() == 2
+        assert frontier.get(timeout=0)[0] == "https://www.example.com/a"
+        assert frontier.get(timeout=0)[0] == "https://www.example.com/b"
+        assert frontier.empty()
+
+    def test_get_timeout_returns_none(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)  # taken but not yet done
+        start = time.time()
+        assert frontier.get(timeout=0.05) is None
+        assert time.time() - start >= 0.04
+
+    def test_finished_after_all_tasks_done(self):
+        frontier = UrlFrontier()
+        assert frontier.finished()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)
+        assert not frontier.finished()
+        frontier.put(("https://www.example.com/a", "https://www.example.com/"))
+        frontier.task_done()
+        assert not frontier.finished()
+        frontier.get(timeout=0)
+        frontier.task_done()
+        assert frontier.finished()
+
+    def test_finish_wakes_waiting_workers(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(frontier.get(timeout=5)))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(0.05)
+        start = time.time()
+        frontier.task_done()
+        for worker in workers:
+            worker.join(timeout=2)
+        assert results == [None, None, None]
+        assert time.time() - start < 1
+
+    def test_wake_all_releases_waiting_workers(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)  # in progress, so workers would wait
+        results = []
+        worker = threading.Thread(target=lambda: results.append(frontier.get(timeout=5)))
+        worker.start()
+        time.sleep(0.05)
+        start = time.time()
+        frontier.wake_all()
+        worker.join(timeout=2)
+        assert results == [None]
+        assert time.time() - start < 1
+        assert not frontier.finished()
+
+    def test_put_wakes_waiting_worker(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)  # in progress, so the frontier isn't finished
+        results = []
+        worker = threading.Thread(target=lambda: results.append(frontier.get(timeout=5)))
+        worker.start()
+        time.sleep(0.05)
+        frontier.put(("https://www.example.com/a", "https://www.example.com/"))
+        worker.join(timeout=2)
+        assert results == [("https://www.example.com/a", "https://www.example.com/")]
+
+    def test_put_many(self):
+        frontier = UrlFrontier()
+        frontier.put(("https://www.example.com/", None))
+        frontier.get(timeout=0)
+        frontier.put_many(
+            (url, "https://www.example.com/")
+            for url in ("https://www.example.com/a", "https://www.example.com/b")
+        )
+        frontier.put_many([])
+        frontier.task_done()
+        assert frontier.qsize() == 2
+        assert not frontier.finished()
+        assert frontier.get(timeout=0)[0] == "https://www.example.com/a"
+        assert frontier.get(timeout=0)[0] == "https://www.example.com/b"
+        frontier.task_done()
+        frontier.task_done()
+        assert frontier.finished()
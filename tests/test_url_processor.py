@@ -187,3 +187,37 @@ class TestFilterUrls:
             "https://www.example.com/c.jpg",
         ]
         assert url_processor.filter_urls(urls) == set()
+
+
+class TestNormalizeWithSources:
+    """Validation, normalization and source lookup happen in one pass."""
+
+    def test_sources_follow_normalized_urls(self, url_processor):
+        urls = [
+            "https://www.example.com/About/",
+            "http://www.example.com/contact",
+            "https://www.example.com/logo.png",
+        ]
+        sources = {"https://www.example.com/About/": "https://www.example.com/"}
+        result = url_processor.normalize_with_sources(urls, sources, "https://www.example.com/sitemap.xml")
+        assert result == {
+            "https://www.example.com/about": "https://www.example.com/",
+            "https://www.example.com/contact": "https://www.example.com/sitemap.xml",
+        }
+
+    def test_empty_input(self, url_processor):
+        assert url_processor.normalize_with_sources(set(), {}, "https://www.example.com") == {}
+
+
+class TestHasSkipExtension:
+    """Last-dot set lookup agrees with a plain per-extension endswith() scan."""
+
+    @pytest.mark.parametrize("path", [
+        "/style.css", "/app.min.js", "/a/B.PDF", "/archive.tar.gz", "/.htaccess",
+        "/main.c", "/about", "/", "", "/blog/post.html", "/c", "/docs.v2",
+        "/v1.2/page", "/lib/X.MIN.JS", "https://www.example.com", "/trailing.",
+    ])
+    def test_matches_endswith(self, path):
+        from sitemap_comparison import has_skip_extension
+        expected = any(path.lower().endswith(ext) for ext in SKIP_EXTENSIONS)
+        assert has_skip_extension(path) is expected
@@ -0,0 +1,358 @@
+"""Tests for WebsiteSpider — link extraction from crawled pages."""
+import http.server
+import threading
+import pytest
+from sitemap_comparison import (
+    WebsiteSpider, CacheManager, UrlProcessor, ObscuraResponse,
+    jittered, fetch_capped, open_session, extract_hrefs, crawl_link, is_transient_error,
+)
+
+
+@pytest.fixture
+def spider(sample_config):
+    return WebsiteSpider(sample_config, CacheManager(sample_config), UrlProcessor(sample_config))
+
+
+PAGE = """<html><body>
+<nav><a href="/about">About</a><a href="/contact#form">Contact</a></nav>
+<a href="/about">About again</a>
+<a href="#top">Top</a>
+<a href="javascript:void(0)">JS</a>
+<a href="mailto:hi@example.com">Mail</a>
+<a href="tel:+15555550100">Call</a>
+<a href="https://other.example.org/page">External</a>
+<a href="/brochure.pdf">PDF</a>
+<a href="/news?utm_source=newsletter">News</a>
+<a href="products/a.html">Relative</a>
+</body></html>"""
+
+
+class TestExtractHrefs:
+    """selectolax, lxml and the BeautifulSoup fallback return the same hrefs."""
+
+    @pytest.fixture(params=["selectolax", "lxml", "html.parser"])
+    def parser(self, request, monkeypatch):
+        if request.param == "selectolax":
+            pytest.importorskip("selectolax.lexbor")
+        else:
+            monkeypatch.setattr("sitemap_comparison.LexborHTMLParser", None)
+        if request.param == "html.parser":
+            monkeypatch.setattr("sitemap_comparison.lxml", None)
+        elif request.param == "lxml":
+            pytest.importorskip("lxml.html")
+        return request.param
+
+    def test_hrefs_in_order(self, parser):
+        html = '<p><a href="/b">b</a><a>no href</a><a href="/a?x=1&amp;y=2">a</a><a href="/b">b</a></p>'
+        assert extract_hrefs(html) == ["/b", "/a?x=1&y=2"]
+
+    def test_bytes_and_empty_documents(self, parser):
+        assert extract_hrefs('<a href="/caf\u00e9">x</a>'.encode("utf-8")) == ["/caf\u00e9"]
+        assert extract_hrefs('<a href="/caf\u00e9">x</a>'.encode("latin-1")) == ["/caf\u00e9"]
+        assert extract_hrefs("") == []
+        assert extract_hrefs(b"") == []
+
+    def test_xml_declaration(self, parser):
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><a href="/x">x</a></body></html>'
+        assert extract_hrefs(html) == ["/x"]
+
+    def test_bare_href(self, parser):
+        assert extract_hrefs('<a href>x</a><a href=" /y ">y</a>') == ["", " /y "]
+
+
+class TestCrawlLink:
+    """Absolute links are filtered and cleaned the same way on every call."""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://www.example.com/about#team", "https://www.example.com/about"),
+        ("https://www.example.com/news?utm_source=x", "https://www.example.com/news"),
+        ("https://other.example.org/page", None),
+        ("ftp://www.example.com/file", None),
+        ("https://www.example.com/report.PDF", None),
+    ])
+    def test_crawl_link(self, url, expected):
+        assert crawl_link(url, "www.example.com") == expected
+        assert crawl_link(url, "www.example.com") == expected  # memoized result
+
+
+class TestExtractLinks:
+    """Each unique same-domain page link is returned once, cleaned."""
+
+    def test_links(self, spider):
+        links = spider.extract_links(PAGE, "https://www.example.com/shop/", "www.example.com")
+        assert sorted(links) == [
+            "https://www.example.com/about",
+            "https://www.example.com/contact",
+            "https://www.example.com/news",
+            "https://www.example.com/shop/products/a.html",
+        ]
+
+    def test_bytes_input(self, spider):
+        links = spider.extract_links(PAGE.encode("utf-8"), "https://www.example.com/", "www.example.com")
+        assert "https://www.example.com/about" in links
+
+    def test_no_links(self, spider):
+        assert spider.extract_links("<html><body>plain</body></html>", "https://www.example.com/", "www.example.com") == []
+
+
+class TestSetInterrupted:
+    """An interrupt ends retry backoffs and frontier waits right away."""
+
+    def test_sets_stop_event_and_wakes_frontier(self, spider, mocker):
+        frontier = mocker.Mock()
+        spider._frontier = frontier
+        spider.set_interrupted()
+        assert spider.interrupted
+        assert spider.stop_event.wait(0)
+        frontier.wake_all.assert_called_once()
+
+
+class TestJittered:
+    """Retry delays get up to 50% jitter, never less than the base delay."""
+
+    @pytest.mark.parametrize("delay", [0.5, 1, 2, 4])
+    def test_bounds(self, delay):
+        for _ in range(50):
+            assert delay <= jittered(delay) <= delay * 1.5
+
+
+class TestIsTransientError:
+    """Timeouts and dropped connections are retried; other failures are not."""
+
+    def test_typed_timeout(self):
+        from curl_cffi.requests.exceptions import Timeout
+        assert is_transient_error(Timeout("Failed to perform"))
+
+    @pytest.mark.parametrize("message, expected", [
+        ("curl: (56) Recv failure: Connection reset by peer", True),
+        ("curl: (28) Operation timed out after 3001 milliseconds", True),
+        ("curl: (6) Could not resolve host: www.example.com", False),
+        ("HTTP Error 404", False),
+    ])
+    def test_message_fallback(self, message, expected):
+        assert is_transient_error(Exception(message)) is expected
+
+
+SITE = {
+    "https://www.example.com": ["/a", "/b"],
+    "https://www.example.com/a": ["/", "/b", "/c"],
+    "https://www.example.com/b": ["/a", "/c"],
+    "https://www.example.com/c": ["/a", "/b"],
+}
+
+
+class TestSpiderWebsite:
+    """Crawling a small interlinked site with a mocked fetcher."""
+
+    def test_each_page_fetched_once(self, spider, mocker):
+        def fake_fetch(url, **kwargs):
+            links = SITE.get(url.rstrip("/"), [])
+            return ObscuraResponse("".join(f'<a href="{href}">x</a>' for href in links))
+
+        fetch = mocker.patch("sitemap_comparison.obscura_fetch", side_effect=fake_fetch)
+        mocker.patch.object(spider.cache_manager, "cache_content")
+
+        found, sources = spider.spider_website()
+
+        fetched = [call.kwargs["url"] for call in fetch.call_args_list]
+        assert len(fetched) == len(set(fetched))
+        assert {url.rstrip("/") for url in found} == set(SITE)
+        assert sources["https://www.example.com/c"] in (
+            "https://www.example.com/a", "https://www.example.com/b"
+        )
+
+    def test_identical_query_variants_parsed_once(self, spider, mocker):
+        pages = {
+            "https://www.example.com": '<a href="/b?v=1">1</a><a href="/b?v=2">2</a><a href="/c">c</a>',
+            "https://www.example.com/c": '<a href="/c?v=3">3</a>',
+        }
+        body_b = '<a href="/d">d</a>'
+
+        def fake_fetch(url, **kwargs):
+            if url.startswith("https://www.example.com/b"):
+                return ObscuraResponse(body_b)
+            return ObscuraResponse(pages.get(url.split("?")[0].rstrip("/"), body_b))
+
+        mocker.patch("sitemap_comparison.obscura_fetch", side_effect=fake_fetch)
+        mocker.patch.object(spider.cache_manager, "cache_content")
+        extract = mocker.patch.object(spider, "extract_links", wraps=spider.extract_links)
+
+        found, _ = spider.spider_website()
+
+        assert {"https://www.example.com/b?v=1", "https://www.example.com/b?v=2",
+                "https://www.example.com/d"} <= found
+        parsed = [call.args[1] for call in extract.call_args_list]
+        # Same body at the same path: only one of the /b variants is parsed...
+        assert sum(url.startswith("https://www.example.com/b") for url in parsed) == 1
+        # ...while the same body at another path (/d) is still parsed
+        assert "https://www.example.com/d" in parsed
+
+    def test_failure_burst_pauses_instead_of_dropping(self, spider, mocker):
+        """A burst of failures longer than the breaker limit doesn't lose pages."""
+        mocker.patch("sitemap_comparison.OBSCURA_RETRY_DELAYS", [0])
+        mocker.patch("sitemap_comparison.HOST_COOLDOWN", 0.05)
+        pages = [f"https://www.example.com/p{i}" for i in range(12)]
+        home = "".join(f'<a href="{url}">x</a>' for url in pages)
+        failures_left = [12]
+
+        def fake_fetch(url, **kwargs):
+            if url.rstrip("/") != "https://www.example.com" and failures_left[0] > 0:
+                failures_left[0] -= 1
+                raise RuntimeError("503 Service Unavailable")
+            return ObscuraResponse(home if url.rstrip("/") == "https://www.example.com" else "")
+
+        mocker.patch("sitemap_comparison.obscura_fetch", side_effect=fake_fetch)
+        mocker.patch.object(spider.cache_manager, "cache_content")
+
+        found, _ = spider.spider_website()
+
+        assert set(pages) <= found
+
+    def test_given_up_host_urls_recorded_as_unfetched(self, spider, mocker):
+        mocker.patch("sitemap_comparison.OBSCURA_RETRY_DELAYS", [0])
+        mocker.patch("sitemap_comparison.HOST_FAILURE_LIMIT", 2)
+        mocker.patch("sitemap_comparison.HOST_MAX_TRIPS", 1)
+        home = "https://www.example.com"
+        pages = [f"{home}/p{i}" for i in range(10)]
+
+        def fake_fetch(url, **kwargs):
+            if url.rstrip("/") == home:
+                return ObscuraResponse("".join(f'<a href="{url}">x</a>' for url in pages))
+            raise RuntimeError("503 Service Unavailable")
+
+        mocker.patch("sitemap_comparison.obscura_fetch", side_effect=fake_fetch)
+        mocker.patch.object(spider.cache_manager, "cache_content")
+
+        found, _ = spider.spider_website()
+
+        assert spider.unfetched_urls
+        assert set(spider.unfetched_urls) <= set(pages)
+        assert not set(spider.unfetched_urls) & found
+        assert set(spider.unfetched_urls.values()) == {home}
+
+
+class TestCacheMissingUrls:
+    """curl_cffi caching goes through the spider's shared session."""
+
+    def test_shared_session_used(self, spider, mocker):
+        spider.config.curl_cffi = True
+        get = mocker.patch.object(spider.session, "get")
+        mocker.patch.object(spider.cache_manager, "cache_content")
+
+        urls = {f"https://www.example.com/p{i}" for i in range(5)}
+        spider.cache_missing_urls(urls)
+
+        assert sorted(call.args[0] for call in get.call_args_list) == sorted(urls)
+
+    def test_body_cached_without_streaming(self, spider, mocker):
+        spider.config.curl_cffi = True
+
+        def fake_get(url, content_callback=None, **kwargs):
+            for chunk in (b"<html>", b"</html>"):
+                content_callback(chunk)
+            return mocker.Mock()
+
+        get = mocker.patch.object(spider.session, "get", side_effect=fake_get)
+        cache = mocker.patch.object(spider.cache_manager, "cache_content")
+
+        spider.cache_missing_urls({"https://www.example.com/p"})
+
+        assert "stream" not in get.call_args.kwargs
+        cache.assert_called_once_with("https://www.example.com/p", b"<html></html>", is_sitemap=False)
+
+    @pytest.mark.parametrize("outcome, expected", [
+        (200, True),
+        (429, False),
+        (503, False),
+        (RuntimeError("Connection reset by peer"), False),
+        (RuntimeError("SSL certificate problem"), None),
+    ])
+    def test_limiter_backs_off_only_when_throttled(self, spider, mocker, outcome, expected):
+        spider.config.curl_cffi = True
+        mocker.patch("sitemap_comparison.CURL_RETRY_DELAYS", [0])
+        if isinstance(outcome, Exception):
+            mocker.patch.object(spider.session, "get", side_effect=outcome)
+        else:
+            mocker.patch.object(spider.session, "get", return_value=mocker.Mock(status_code=outcome))
+        mocker.patch.object(spider.cache_manager, "cache_content")
+        release = mocker.patch("sitemap_comparison.AdaptiveLimiter.release", autospec=True)
+
+        spider.cache_missing_urls({"https://www.example.com/p"})
+
+        assert release.call_args.kwargs == {"success": expected}
+
+
+@pytest.fixture
+def local_server():
+    """Local HTTP/1.1 server serving N bytes at /N (HTML unless ?type= says
+    otherwise); counts connections."""
+    connections = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):
+            size, _, content_type = self.path.strip("/").partition("?type=")
+            body = b"x" * int(size)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type or "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                pass  # client cut the transfer off
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", connections
+    server.shutdown()
+    server.server_close()
+
+
+class TestFetchCapped:
+    """Bodies are capped without stream=True, so the connection is kept alive."""
+
+    def test_connection_reused(self, local_server):
+        base, connections = local_server
+        session = open_session(base)
+        for _ in range(5):
+            response, body = fetch_capped(session, f"{base}/100", timeout=3)
+            assert response.status_code == 200
+            assert body == b"x" * 100
+        assert len(connections) == 1
+
+    def test_truncated_at_limit(self, local_server):
+        base, _ = local_server
+        response, body = fetch_capped(open_session(base), f"{base}/500000", limit=1000, timeout=3)
+        assert body == b"x" * 1000
+        assert response.headers.get("Content-Type") == "text/html"
+
+    def test_non_html_aborted_at_first_chunk(self, local_server, mocker):
+        base, _ = local_server
+        session = open_session(base)
+        get = session.get
+        chunks = []
+
+        def counting_get(url, content_callback, **kwargs):
+            def counted(chunk):
+                chunks.append(len(chunk))
+                return content_callback(chunk)
+            return get(url, content_callback=counted, **kwargs)
+
+        mocker.patch.object(session, "get", side_effect=counting_get)
+        response, body = fetch_capped(session, f"{base}/20000000?type=application/pdf",
+                                      html_only=True, timeout=3)
+        assert response.headers.get("Content-Type") == "application/pdf"
+        assert body == b""
+        assert len(chunks) == 1
+
+        response, body = fetch_capped(session, f"{base}/100", html_only=True, timeout=3)
+        assert body == b"x" * 100